@@ -0,0 +1,228 @@
+"""
+Precomputed hiring analytics: skill frequency, role distribution, experience
+histogram and daily interview volume.
+
+    python -m app.aggregates            # print the current summary
+    python -m app.aggregates --rebuild  # recompute everything from interview_logs
+
+The dashboards used to scan interview_logs and json.loads every skills value
+on each load. Instead, small summary tables are kept up to date by SQLite
+triggers. Each insert, update and delete on interview_logs adjusts the
+affected counters in the same transaction. So /stats reads a few short
+tables, and its cost doesn't grow with the archive. A skill is counted once
+per interview, case-insensitively. --rebuild recomputes the tables from
+scratch, e.g. after editing the database by hand with triggers disabled.
+"""
+import argparse
+import json
+import logging
+
+from sqlalchemy import text
+
+from .metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+EXPERIENCE_CAP = 20  # years; the last histogram bucket is "20+"
+
+_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS stats_totals (
+        name TEXT PRIMARY KEY, value INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stats_skills (
+        skill TEXT PRIMARY KEY COLLATE NOCASE, interviews INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_stats_skills_interviews ON stats_skills(interviews)",
+    """
+    CREATE TABLE IF NOT EXISTS stats_roles (
+        role TEXT PRIMARY KEY COLLATE NOCASE, interviews INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_stats_roles_interviews ON stats_roles(interviews)",
+    """
+    CREATE TABLE IF NOT EXISTS stats_experience (
+        bucket INTEGER PRIMARY KEY, interviews INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stats_daily (
+        day TEXT PRIMARY KEY, interviews INTEGER NOT NULL
+    )
+    """,
+]
+
+
+# Per-row expressions, written against the trigger's new./old. row. Malformed
+# skills JSON counts as no skills rather than failing the write.
+def _skills(row):
+    return (
+        f"SELECT DISTINCT trim(value) COLLATE NOCASE AS skill FROM json_each("
+        f"CASE WHEN json_valid({row}.skills) THEN {row}.skills ELSE '[]' END) "
+        f"WHERE type = 'text' AND trim(value) != ''"
+    )
+
+
+def _role(row):
+    return f"coalesce(nullif(trim({row}.desired_role), ''), 'Unknown')"
+
+
+def _bucket(row):
+    return (
+        f"CASE WHEN {row}.years_experience IS NULL THEN -1 "
+        f"WHEN {row}.years_experience >= {EXPERIENCE_CAP} THEN {EXPERIENCE_CAP} "
+        f"ELSE max(0, CAST({row}.years_experience AS INTEGER)) END"
+    )
+
+
+def _day(row):
+    return f"coalesce(date({row}.timestamp), 'unknown')"
+
+
+def _add(row):
+    # The WHERE true resolves the INSERT ... SELECT ... ON CONFLICT parsing ambiguity
+    return f"""
+        INSERT INTO stats_skills(skill, interviews) SELECT skill, 1 FROM ({_skills(row)}) WHERE true
+            ON CONFLICT(skill) DO UPDATE SET interviews = interviews + 1;
+        INSERT INTO stats_roles(role, interviews) VALUES ({_role(row)}, 1)
+            ON CONFLICT(role) DO UPDATE SET interviews = interviews + 1;
+        INSERT INTO stats_experience(bucket, interviews) VALUES ({_bucket(row)}, 1)
+            ON CONFLICT(bucket) DO UPDATE SET interviews = interviews + 1;
+    """
+
+
+def _remove(row):
+    return f"""
+        UPDATE stats_skills SET interviews = interviews - 1 WHERE skill IN ({_skills(row)});
+        DELETE FROM stats_skills WHERE interviews <= 0;
+        UPDATE stats_roles SET interviews = interviews - 1 WHERE role = {_role(row)};
+        DELETE FROM stats_roles WHERE interviews <= 0;
+        UPDATE stats_experience SET interviews = interviews - 1 WHERE bucket = {_bucket(row)};
+        DELETE FROM stats_experience WHERE interviews <= 0;
+    """
+
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS interview_logs_stats_ai AFTER INSERT ON interview_logs BEGIN
+        {_add("new")}
+        INSERT INTO stats_daily(day, interviews) VALUES ({_day("new")}, 1)
+            ON CONFLICT(day) DO UPDATE SET interviews = interviews + 1;
+        INSERT INTO stats_totals(name, value) VALUES ('interviews', 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS interview_logs_stats_ad AFTER DELETE ON interview_logs BEGIN
+        {_remove("old")}
+        UPDATE stats_daily SET interviews = interviews - 1 WHERE day = {_day("old")};
+        DELETE FROM stats_daily WHERE interviews <= 0;
+        UPDATE stats_totals SET value = value - 1 WHERE name = 'interviews';
+    END
+    """,
+    # Re-extraction rewrites the extracted fields of existing rows
+    f"""
+    CREATE TRIGGER IF NOT EXISTS interview_logs_stats_au
+    AFTER UPDATE OF skills, desired_role, years_experience ON interview_logs BEGIN
+        {_remove("old")}
+        {_add("new")}
+    END
+    """,
+]
+
+_REBUILD = [
+    "DELETE FROM stats_totals",
+    "DELETE FROM stats_skills",
+    "DELETE FROM stats_roles",
+    "DELETE FROM stats_experience",
+    "DELETE FROM stats_daily",
+    "INSERT INTO stats_totals(name, value) SELECT 'interviews', count(*) FROM interview_logs",
+    """
+    INSERT INTO stats_skills(skill, interviews)
+    SELECT skill, count(*) FROM (
+        SELECT DISTINCT l.id, trim(j.value) COLLATE NOCASE AS skill
+        FROM interview_logs AS l,
+             json_each(CASE WHEN json_valid(l.skills) THEN l.skills ELSE '[]' END) AS j
+        WHERE j.type = 'text' AND trim(j.value) != ''
+    ) GROUP BY skill
+    """,
+    f"INSERT INTO stats_roles(role, interviews) SELECT {_role('l')} AS role, count(*) FROM interview_logs AS l GROUP BY role",
+    f"INSERT INTO stats_experience(bucket, interviews) SELECT {_bucket('l')} AS b, count(*) FROM interview_logs AS l GROUP BY b",
+    f"INSERT INTO stats_daily(day, interviews) SELECT {_day('l')} AS d, count(*) FROM interview_logs AS l GROUP BY d",
+]
+
+
+def setup_aggregates(engine) -> None:
+    """Create the summary tables and triggers, backfilling them on first run"""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_totals'")
+        ).first()
+        for statement in _TABLES + _TRIGGERS:
+            conn.execute(text(statement))
+        if not exists:
+            rebuild_aggregates(conn)
+
+
+def rebuild_aggregates(conn) -> None:
+    """Recompute every summary table from interview_logs (one transaction)"""
+    for statement in _REBUILD:
+        conn.execute(text(statement))
+
+
+def _bucket_label(bucket: int) -> str:
+    if bucket < 0:
+        return "unknown"
+    return f"{EXPERIENCE_CAP}+" if bucket >= EXPERIENCE_CAP else str(bucket)
+
+
+def read_stats(db, top: int = 20, days: int = 30) -> dict:
+    """Dashboard summary; every query reads a small summary table, never interview_logs"""
+    total = db.execute(text("SELECT value FROM stats_totals WHERE name = 'interviews'")).scalar()
+    skills = db.execute(
+        text("SELECT skill, interviews FROM stats_skills ORDER BY interviews DESC, skill LIMIT :top"),
+        {"top": top},
+    )
+    roles = db.execute(
+        text("SELECT role, interviews FROM stats_roles ORDER BY interviews DESC, role LIMIT :top"),
+        {"top": top},
+    )
+    experience = db.execute(text("SELECT bucket, interviews FROM stats_experience ORDER BY bucket"))
+    daily = db.execute(
+        text("SELECT day, interviews FROM stats_daily ORDER BY day DESC LIMIT :days"), {"days": days}
+    )
+    return {
+        "interviews": total or 0,
+        "skills": [{"skill": skill, "interviews": n} for skill, n in skills],
+        "roles": [{"role": role, "interviews": n} for role, n in roles],
+        "experience": [{"years": _bucket_label(bucket), "interviews": n} for bucket, n in experience],
+        "daily": [{"day": day, "interviews": n} for day, n in reversed(daily.fetchall())],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or rebuild the precomputed interview statistics")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute all summary tables from interview_logs")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    configure_logging()
+
+    from .db import SessionLocal, engine
+
+    if args.rebuild:
+        with engine.begin() as conn:
+            rebuild_aggregates(conn)
+        logger.info("Summary tables rebuilt")
+    db = SessionLocal()
+    try:
+        print(json.dumps(read_stats(db, top=args.top, days=args.days), indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,63 +5,173 @@ warnings.filterwarnings("ignore", message=".*pkg_resources.*")
 warnings.filterwarnings("ignore", message=".*pkg_resources is deprecated.*")
 
 from faster_whisper import WhisperModel
+import logging
 import os
 import tempfile
 import shutil
+import time
+from prometheus_client import Counter
+from .metrics import stage_span, observe_whisper
+from .preprocess import SAMPLE_RATE, load_audio, preprocess_audio, PreprocessedAudio
+from .segments import SegmentArray
+from .diarization import diarize, candidate_text
+from .calibrate import load_profile
+from . import model_server
+
+logger = logging.getLogger(__name__)
+
+# Silence trimming before Whisper; set AUDIO_VAD=0 to transcribe the raw audio
+VAD_ENABLED = os.getenv("AUDIO_VAD", "1") == "1"
+# Per-word timings cost extra decoding time, so they are opt-in
+WORD_TIMESTAMPS = os.getenv("WHISPER_WORD_TIMESTAMPS", "0") == "1"
+# Split interviewer and candidate turns; set AUDIO_DIARIZATION=0 to skip
+DIARIZATION_ENABLED = os.getenv("AUDIO_DIARIZATION", "1") == "1"
+
+SILENCE_REMOVED_SECONDS = Counter(
+    "audio_silence_removed_seconds_total", "Seconds of silence trimmed before transcription"
+)
 
 # Global model instance to avoid reloading
 _whisper_model = None
 
+# Model settings, overridable per process (the batch ingest CLI sets the
+# thread count for each of its transcription workers). Unset ones come from
+# the host profile written by `python -m app.calibrate`, if there is one.
+_profile = load_profile()
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE") or _profile.get("model_size", "small")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE") or _profile.get("compute_type", "int8")
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE") or _profile.get("beam_size", 5))
+
 def get_whisper_model():
     """Get or create the global Whisper model instance"""
     global _whisper_model
     if _whisper_model is None:
-        print("[AUDIO_UTILS] Loading Whisper model (this may take a moment on first run)...")
-        _whisper_model = WhisperModel('small', device='cpu', compute_type='int8')
-        print("[AUDIO_UTILS] Whisper model loaded successfully")
+        logger.info("Loading Whisper model %s/%s (this may take a moment on first run)", WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE)
+        _whisper_model = WhisperModel(
+            WHISPER_MODEL_SIZE,
+            device='cpu',
+            compute_type=WHISPER_COMPUTE_TYPE,
+            cpu_threads=int(os.getenv("WHISPER_CPU_THREADS") or _profile.get("cpu_threads", 0)),
+        )
+        logger.info("Whisper model loaded")
     return _whisper_model
 
-def transcribe_audio(file_path: str) -> str:
+def _run_whisper(model, audio, time_map=None, **options):
+    """
+    One Whisper pass, timed; segments are lazy, so decoding happens while they
+    are collected. Returns the joined text and a compact SegmentArray.
+    """
+    audio_seconds = len(audio) / SAMPLE_RATE
+    with stage_span("whisper", audio_seconds=f"{audio_seconds:.1f}") as span:
+        start = time.perf_counter()
+        segments, info = model.transcribe(audio, word_timestamps=WORD_TIMESTAMPS, **options)
+        segments = list(segments)
+        transcription = " ".join([segment.text for segment in segments])
+        rtf = observe_whisper(audio_seconds, time.perf_counter() - start)
+        span["rtf"] = f"{rtf:.3f}"
+        span["chars"] = len(transcription)
+        span["segments"] = len(segments)
+    return transcription.strip(), SegmentArray.from_whisper(segments, time_map)
+
+def _prepare_audio(file_path):
+    """Decode (if given a path) and strip silence; returns a PreprocessedAudio"""
+    if isinstance(file_path, str):
+        with stage_span("audio_decode"):
+            audio = load_audio(file_path)
+    else:
+        audio = file_path
+    if not VAD_ENABLED:
+        return PreprocessedAudio(audio, [(0, len(audio))], audio)
+    with stage_span("preprocess") as span:
+        prepared = preprocess_audio(audio)
+        span.update(prepared.stats())
+    SILENCE_REMOVED_SECONDS.inc(prepared.removed_seconds)
+    return prepared
+
+def _diarize(prepared: PreprocessedAudio, segments: SegmentArray) -> dict:
+    """Label segment speakers in place; failures only cost the filtering"""
+    try:
+        with stage_span("diarize", segments=len(segments)) as span:
+            speaker_stats = diarize(prepared.original, segments)
+            span.update(speaker_stats)
+        return speaker_stats
+    except Exception as e:
+        logger.warning("Diarization failed (non-critical): %s", e)
+        segments.speakers = None
+        return {}
+
+def transcribe_audio_locally(file_path) -> dict:
+    """
+    Transcribe an audio file path, or an already decoded 16 kHz mono float32 array,
+    with the in-process Whisper model.
+    Returns the text, timestamped segments (on the original recording's
+    timeline), the candidate's turns only ("candidate_text", for extraction)
+    and audio stats (duration, speech kept, silence removed, speaking time).
+    """
+    stats = {}
+    segments = None
     try:
-        print(f"[AUDIO_UTILS] Starting transcription for: {file_path}")
-        
         # Get the global model instance
         model = get_whisper_model()
-        
+        prepared = _prepare_audio(file_path)
+        stats = prepared.stats()
+        audio = prepared.audio
+        time_map = prepared.to_original_time
+        # Let Whisper's 30 s windows start at utterance boundaries
+        options = {"beam_size": WHISPER_BEAM_SIZE}
+        if len(prepared.chunks) > 1:
+            options["clip_timestamps"] = [t for chunk in prepared.chunks for t in chunk]
+
         # Try to transcribe directly first
         try:
-            print("[AUDIO_UTILS] Attempting direct transcription...")
-            segments, info = model.transcribe(file_path)
-            transcription = " ".join([segment.text for segment in segments])
-            result = transcription.strip()
-            print(f"[AUDIO_UTILS] Direct transcription successful: {result}")
-            return result
+            text, segments = _run_whisper(model, audio, time_map, **options)
         except Exception as e:
-            print(f"[AUDIO_UTILS] Direct transcription failed: {e}")
-            
+            logger.warning("Direct transcription failed: %s", e)
+
             # Try with different parameters
             try:
-                print("[AUDIO_UTILS] Attempting transcription with language specification...")
-                segments, info = model.transcribe(file_path, language='en')
-                transcription = " ".join([segment.text for segment in segments])
-                result = transcription.strip()
-                print(f"[AUDIO_UTILS] Language-specific transcription successful: {result}")
-                return result
+                logger.info("Retrying transcription with language specification")
+                text, segments = _run_whisper(model, audio, time_map, language='en', **options)
             except Exception as e2:
-                print(f"[AUDIO_UTILS] Language-specific transcription failed: {e2}")
-                
+                logger.warning("Language-specific transcription failed: %s", e2)
+
                 # Try with different model settings
                 try:
-                    print("[AUDIO_UTILS] Attempting transcription with different settings...")
-                    segments, info = model.transcribe(file_path, beam_size=5)
-                    transcription = " ".join([segment.text for segment in segments])
-                    result = transcription.strip()
-                    print(f"[AUDIO_UTILS] Alternative transcription successful: {result}")
-                    return result
+                    logger.info("Retrying transcription with beam_size=5")
+                    text, segments = _run_whisper(model, audio, time_map, beam_size=5)
                 except Exception as e3:
-                    print(f"[AUDIO_UTILS] All transcription attempts failed: {e3}")
-                    return "Audio transcription failed. Please try with a different audio file."
-                
+                    logger.error("All transcription attempts failed: %s", e3)
+                    text = "Audio transcription failed. Please try with a different audio file."
+
+        if DIARIZATION_ENABLED and segments is not None and len(segments):
+            stats.update(_diarize(prepared, segments))
+
     except Exception as e:
-        print(f"[AUDIO_UTILS] Transcription error: {e}")
-        return "Audio transcription failed. Please try again." 
\ No newline at end of file
+        logger.error("Transcription error: %s", e)
+        text = "Audio transcription failed. Please try again."
+    return {
+        "text": text,
+        "candidate_text": candidate_text(segments, fallback=text),
+        "segments": segments,
+        "audio_stats": stats,
+    }
+
+def transcribe_audio_with_details(file_path) -> dict:
+    """Transcribe on the shared model server when one is configured, else in-process"""
+    if not model_server.enabled():
+        return transcribe_audio_locally(file_path)
+    if isinstance(file_path, str):
+        file_path = os.path.abspath(file_path)  # the server may run from another directory
+    try:
+        result = model_server.call("transcribe", file_path)
+    except model_server.ModelServerError as e:
+        logger.error("Transcription error: %s", e)
+        text = "Audio transcription failed. Please try again."
+        return {"text": text, "candidate_text": text, "segments": None, "audio_stats": {}}
+    if result["segments"] is not None:
+        result["segments"] = SegmentArray.unpack(result["segments"])
+    return result
+
+def transcribe_audio(file_path) -> str:
+    """Transcribe an audio file path, or an already decoded 16 kHz mono float32 array"""
+    return transcribe_audio_with_details(file_path)["text"]
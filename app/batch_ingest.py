@@ -0,0 +1,334 @@
+"""
+Bulk ingest of recorded interviews.
+
+    python -m app.batch_ingest recordings/ --transcribe-workers 4
+    python -m app.batch_ingest manifest.jsonl --checkpoint ingest.ckpt
+
+The input is either a directory of audio files or a manifest (one path per
+line, or JSON lines with a "path" key). Files go through a pipeline of
+decode -> transcribe_audio -> extract_entities -> DB insert where each stage
+has its own worker pool, so decoding the next file, transcribing the current
+ones and waiting on the LLM all overlap. Decoded audio is handed from the
+decode to the transcribe workers as .npy files in a temporary spool directory
+rather than pickled through the parent, so a long recording is never copied
+over IPC or held by the coordinating process. Files whose sha256 is already in the
+database or in the checkpoint file are skipped, so an interrupted run can
+simply be started again.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from .metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {".wav", ".webm", ".mp3", ".m4a", ".ogg", ".flac"}
+SAMPLE_RATE = 16000
+
+
+def discover_inputs(source: str) -> list:
+    """Resolve a directory or manifest file into a list of audio paths"""
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    base = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return paths
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_checkpoint(path: str) -> set:
+    done = set()
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["audio_hash"])
+                except (ValueError, KeyError):
+                    continue  # a torn last line from an interrupted run
+    return done
+
+
+def _decode_stage(path: str, spool_dir: str):
+    import numpy as np
+
+    from .preprocess import load_audio
+
+    start = time.perf_counter()
+    audio = load_audio(path)
+    spooled = os.path.join(spool_dir, f"{uuid.uuid4().hex}.npy")
+    np.save(spooled, audio)
+    return spooled, len(audio) / SAMPLE_RATE, time.perf_counter() - start
+
+
+def _init_transcribe_worker(cpu_threads: int):
+    configure_logging()
+    os.environ["WHISPER_CPU_THREADS"] = str(cpu_threads)
+    from . import model_server
+    from .audio_utils import get_whisper_model
+
+    if not model_server.enabled():
+        get_whisper_model()
+
+
+def _transcribe_stage(spooled: str):
+    import numpy as np
+
+    from .audio_utils import transcribe_audio_with_details
+
+    start = time.perf_counter()
+    try:
+        audio = np.load(spooled)
+    finally:
+        os.remove(spooled)
+    transcribed = transcribe_audio_with_details(audio)
+    del audio
+    transcription = transcribed["text"]
+    if not transcription or transcription.startswith("Audio transcription failed"):
+        raise RuntimeError("transcription failed")
+    # Segments cross the process boundary already packed: one bytes object
+    # pickles far cheaper than a list of per-segment objects
+    segments = transcribed["segments"]
+    packed = segments.pack() if segments is not None else None
+    return (transcription, transcribed["candidate_text"], packed), time.perf_counter() - start
+
+
+def _extract_stage(transcription: str):
+    from .nlp import extract_entities
+
+    start = time.perf_counter()
+    analysis = extract_entities(transcription)
+    return analysis, time.perf_counter() - start
+
+
+class IngestReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.discovered = 0
+        self.skipped = 0
+        self.ingested = 0
+        self.failed = []
+        self.audio_seconds = 0.0
+        self.stage_seconds = {"decode": 0.0, "transcribe": 0.0, "extract": 0.0, "insert": 0.0}
+
+    def print(self):
+        wall = time.perf_counter() - self.started
+        print("\n[BATCH] ===== Ingest report =====")
+        print(f"[BATCH] Files discovered : {self.discovered}")
+        print(f"[BATCH] Already done     : {self.skipped}")
+        print(f"[BATCH] Ingested         : {self.ingested}")
+        print(f"[BATCH] Failed           : {len(self.failed)}")
+        print(f"[BATCH] Wall time        : {wall:.1f}s")
+        print(f"[BATCH] Audio processed  : {self.audio_seconds / 60:.1f} min")
+        if wall > 0:
+            print(f"[BATCH] Throughput       : {self.ingested / wall * 3600:.1f} files/hour, "
+                  f"{self.audio_seconds / wall:.2f}x real time")
+        for stage, seconds in self.stage_seconds.items():
+            mean = seconds / self.ingested if self.ingested else 0.0
+            print(f"[BATCH] {stage:<10} busy {seconds:8.1f}s  mean {mean:6.2f}s/file")
+        for path, error in self.failed:
+            print(f"[BATCH] FAILED {path}: {error}")
+
+
+def run_ingest(
+    paths: list,
+    decode_workers: int = 2,
+    transcribe_workers: int = 2,
+    transcribe_threads: int = 2,
+    extract_workers: int = 4,
+    commit_every: int = 10,
+    checkpoint: str = None,
+    index: bool = True,
+) -> IngestReport:
+    from .db import SessionLocal
+    from .models import InterviewLog
+    from .nlp import extraction_version
+
+    report = IngestReport()
+    report.discovered = len(paths)
+
+    # Idempotency: drop files already ingested, either by an earlier batch
+    # (checkpoint) or through the HTTP upload endpoint (audio_hash column)
+    done = load_checkpoint(checkpoint)
+    db = SessionLocal()
+    hashed = [(path, hash_file(path)) for path in paths]
+    candidates = [h for _, h in hashed if h not in done]
+    for i in range(0, len(candidates), 500):
+        rows = db.query(InterviewLog.audio_hash).filter(
+            InterviewLog.audio_hash.in_(candidates[i:i + 500])
+        )
+        done.update(row.audio_hash for row in rows)
+
+    queue, seen = [], set()
+    for path, audio_hash in hashed:
+        if audio_hash in done or audio_hash in seen:
+            report.skipped += 1
+            continue
+        seen.add(audio_hash)
+        queue.append((path, audio_hash))
+    logger.info("%d files to ingest, %d already done", len(queue), report.skipped)
+
+    # spawn keeps the workers free of the parent's torch/LLM client state
+    ctx = multiprocessing.get_context("spawn")
+    decode_pool = ProcessPoolExecutor(decode_workers, mp_context=ctx)
+    transcribe_pool = ProcessPoolExecutor(
+        transcribe_workers,
+        mp_context=ctx,
+        initializer=_init_transcribe_worker,
+        initargs=(transcribe_threads,),
+    )
+    extract_pool = ThreadPoolExecutor(extract_workers)
+    spool_dir = tempfile.mkdtemp(prefix="batch_ingest_")
+
+    # Bound the number of decoded-but-untranscribed files in the spool
+    max_audio_in_flight = decode_workers + transcribe_workers * 2
+    audio_in_flight = 0
+    pending = {}
+    to_insert = []
+    checkpoint_file = open(checkpoint, "a") if checkpoint else None
+
+    def flush():
+        if not to_insert:
+            return
+        start = time.perf_counter()
+        logs = []
+        for path, audio_hash, (transcription, _, packed_segments), analysis in to_insert:
+            log = InterviewLog(
+                filename=os.path.basename(path),
+                audio_hash=audio_hash,
+                transcription=transcription,
+                segments=packed_segments,
+            )
+            log.set_extraction(analysis, **extraction_version(analysis))
+            logs.append(log)
+        db.add_all(logs)
+        db.commit()
+        if index:
+            try:
+                from .semantic import index_interviews
+
+                index_interviews(logs)
+            except Exception as e:
+                logger.warning("Semantic indexing failed (non-critical): %s", e)
+        if checkpoint_file:
+            for log in logs:
+                checkpoint_file.write(json.dumps({"audio_hash": log.audio_hash, "log_id": log.id}) + "\n")
+            checkpoint_file.flush()
+        report.ingested += len(logs)
+        report.stage_seconds["insert"] += time.perf_counter() - start
+        to_insert.clear()
+        logger.info("Committed %d/%d", report.ingested, len(queue))
+
+    try:
+        next_item = 0
+        while next_item < len(queue) or pending:
+            while next_item < len(queue) and audio_in_flight < max_audio_in_flight:
+                path, audio_hash = queue[next_item]
+                next_item += 1
+                audio_in_flight += 1
+                pending[decode_pool.submit(_decode_stage, path, spool_dir)] = ("decode", path, audio_hash, None)
+
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, path, audio_hash, transcribed = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if stage != "extract":
+                        audio_in_flight -= 1
+                    report.failed.append((path, f"{stage}: {e}"))
+                    continue
+
+                if stage == "decode":
+                    spooled, audio_seconds, seconds = result
+                    report.stage_seconds["decode"] += seconds
+                    report.audio_seconds += audio_seconds
+                    pending[transcribe_pool.submit(_transcribe_stage, spooled)] = ("transcribe", path, audio_hash, None)
+                elif stage == "transcribe":
+                    audio_in_flight -= 1
+                    transcribed, seconds = result
+                    report.stage_seconds["transcribe"] += seconds
+                    # only the candidate's turns go to the LLM; the full
+                    # transcription and packed segments ride along in the
+                    # pending entry to the insert stage
+                    pending[extract_pool.submit(_extract_stage, transcribed[1])] = (
+                        "extract", path, audio_hash, transcribed
+                    )
+                else:
+                    analysis, seconds = result
+                    report.stage_seconds["extract"] += seconds
+                    to_insert.append((path, audio_hash, transcribed, analysis))
+                    if len(to_insert) >= commit_every:
+                        flush()
+        flush()
+    finally:
+        decode_pool.shutdown(cancel_futures=True)
+        transcribe_pool.shutdown(cancel_futures=True)
+        extract_pool.shutdown(cancel_futures=True)
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        if checkpoint_file:
+            checkpoint_file.close()
+        db.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-ingest a backlog of recorded interviews")
+    parser.add_argument("source", help="Directory of audio files or a manifest file")
+    parser.add_argument("--decode-workers", type=int, default=2)
+    parser.add_argument("--transcribe-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--transcribe-threads", type=int, default=2,
+                        help="CPU threads per Whisper worker")
+    parser.add_argument("--extract-workers", type=int, default=4,
+                        help="Concurrent LLM extraction calls")
+    parser.add_argument("--commit-every", type=int, default=10)
+    parser.add_argument("--checkpoint", default="batch_ingest.ckpt",
+                        help="Append-only record of ingested hashes, used to resume")
+    parser.add_argument("--no-index", action="store_true", help="Skip semantic indexing")
+    args = parser.parse_args()
+    configure_logging()
+
+    paths = discover_inputs(args.source)
+    report = run_ingest(
+        paths,
+        decode_workers=args.decode_workers,
+        transcribe_workers=args.transcribe_workers,
+        transcribe_threads=args.transcribe_threads,
+        extract_workers=args.extract_workers,
+        commit_every=args.commit_every,
+        checkpoint=args.checkpoint,
+        index=not args.no_index,
+    )
+    report.print()
+
+
+if __name__ == "__main__":
+    main()
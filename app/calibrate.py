@@ -0,0 +1,283 @@
+"""
+Pick the fastest adequate Whisper configuration for this host.
+
+    python -m app.calibrate                                  # default grid, writes whisper_profile.json
+    python -m app.calibrate --models tiny,base --threads 4,8 --max-wer-increase 0.03
+
+Every candidate (model size x compute type x beam size x CPU threads)
+transcribes the bundled sample_audio clips through the same preprocessing as
+the API. Each model size/compute type/thread count runs in a fresh process,
+so the peak RSS reported for it is its own. Word error rate is measured
+against sample_audio/references.json ({"Ananya.wav": "reference text", ...})
+when it exists. Otherwise the most expensive candidate's output is the
+pseudo-reference, so the WER is relative to it. The winner is the candidate
+with the lowest real-time factor whose WER is within --max-wer-increase of the
+most accurate one (and under --max-rss-mb, if given).
+
+The result is written as a host profile. audio_utils loads it at startup
+when it was made on the same kind of host (CPU model and core count), and
+explicit WHISPER_* environment variables still take precedence.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import re
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from .metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+WHISPER_PROFILE_PATH = os.getenv("WHISPER_PROFILE_PATH", "whisper_profile.json")
+SAMPLE_AUDIO_DIR = "sample_audio"
+REFERENCES_FILE = "references.json"
+
+# Cheapest first within each axis; the last combination is the pseudo-reference
+DEFAULT_MODELS = "tiny,base,small"
+DEFAULT_COMPUTE_TYPES = "int8,int8_float32,float32"
+DEFAULT_BEAM_SIZES = "1,5"
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def host_fingerprint() -> dict:
+    """What makes two nodes 'the same kind' for Whisper performance"""
+    return {"machine": platform.machine(), "cpu_model": _cpu_model(), "cpu_count": os.cpu_count()}
+
+
+def load_profile(path: str = WHISPER_PROFILE_PATH) -> dict:
+    """Calibrated Whisper settings for this host, or {} if there are none that apply"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable Whisper profile %s: %s", path, e)
+        return {}
+    if profile.get("host") != host_fingerprint():
+        logger.warning("Whisper profile %s was calibrated on a different host type; ignoring it", path)
+        return {}
+    return profile.get("config", {})
+
+
+def normalize_words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """(substitutions + deletions + insertions) / reference words"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def _measure(model_size: str, compute_type: str, cpu_threads: int, beam_sizes: List[int], files: List[str]) -> dict:
+    """Runs in a fresh process: load one model, transcribe every clip at each beam size"""
+    import resource
+
+    from faster_whisper import WhisperModel
+
+    from . import audio_utils
+    from .preprocess import SAMPLE_RATE, load_audio
+
+    start = time.perf_counter()
+    model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+    load_seconds = time.perf_counter() - start
+
+    clips = {path: load_audio(path) for path in files}
+    prepared = {path: audio_utils._prepare_audio(audio) for path, audio in clips.items()}
+    # One untimed pass so lazy initialisation doesn't count against the first clip
+    audio_utils._run_whisper(model, prepared[files[0]].audio, beam_size=beam_sizes[0])
+
+    runs = []
+    for beam_size in beam_sizes:
+        elapsed, audio_seconds, texts = 0.0, 0.0, {}
+        for path in files:
+            clip = prepared[path]
+            options = {"beam_size": beam_size}
+            if len(clip.chunks) > 1:
+                options["clip_timestamps"] = [t for chunk in clip.chunks for t in chunk]
+            start = time.perf_counter()
+            text, _ = audio_utils._run_whisper(model, clip.audio, clip.to_original_time, **options)
+            elapsed += time.perf_counter() - start
+            audio_seconds += len(clips[path]) / SAMPLE_RATE
+            texts[os.path.basename(path)] = text
+        runs.append({"beam_size": beam_size, "rtf": elapsed / audio_seconds, "texts": texts})
+
+    return {
+        "load_seconds": load_seconds,
+        # ru_maxrss is in KiB on Linux; the peak of this process only
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "runs": runs,
+    }
+
+
+def _load_references(audio_dir: str) -> Optional[dict]:
+    path = os.path.join(audio_dir, REFERENCES_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def calibrate(
+    models: List[str],
+    compute_types: List[str],
+    beam_sizes: List[int],
+    threads: List[int],
+    audio_dir: str = SAMPLE_AUDIO_DIR,
+    max_wer_increase: float = 0.05,
+    max_rss_mb: Optional[float] = None,
+) -> dict:
+    files = sorted(
+        os.path.join(audio_dir, name) for name in os.listdir(audio_dir) if name.lower().endswith(".wav")
+    )
+    if not files:
+        raise ValueError(f"No .wav clips in {audio_dir}")
+
+    # spawn: every candidate starts from an empty process, so RSS peaks don't mix
+    ctx = multiprocessing.get_context("spawn")
+    candidates = []
+    for model_size in models:
+        for compute_type in compute_types:
+            for cpu_threads in threads:
+                logger.info("Measuring %s/%s with %d threads", model_size, compute_type, cpu_threads)
+                with ctx.Pool(1) as pool:
+                    try:
+                        measured = pool.apply(_measure, (model_size, compute_type, cpu_threads, beam_sizes, files))
+                    except Exception as e:
+                        logger.warning("Skipping %s/%s: %s", model_size, compute_type, e)
+                        continue
+                for run in measured["runs"]:
+                    candidates.append({
+                        "model_size": model_size,
+                        "compute_type": compute_type,
+                        "beam_size": run["beam_size"],
+                        "cpu_threads": cpu_threads,
+                        "rtf": run["rtf"],
+                        "peak_rss_mb": measured["peak_rss_mb"],
+                        "load_seconds": measured["load_seconds"],
+                        "texts": run["texts"],
+                    })
+    if not candidates:
+        raise RuntimeError("No configuration could be measured")
+
+    references = _load_references(audio_dir)
+    reference_source = REFERENCES_FILE
+    if references is None:
+        reference = candidates[-1]
+        references = reference["texts"]
+        reference_source = (
+            f"pseudo: {reference['model_size']}/{reference['compute_type']}/beam {reference['beam_size']}"
+        )
+    for candidate in candidates:
+        texts = candidate.pop("texts")
+        scored = [word_error_rate(references[name], texts[name]) for name in texts if name in references]
+        candidate["wer"] = sum(scored) / len(scored) if scored else None
+
+    best_wer = min((c["wer"] for c in candidates if c["wer"] is not None), default=None)
+    eligible = [
+        c for c in candidates
+        if (best_wer is None or (c["wer"] is not None and c["wer"] <= best_wer + max_wer_increase))
+        and (max_rss_mb is None or c["peak_rss_mb"] <= max_rss_mb)
+    ]
+    if not eligible:
+        raise RuntimeError("No configuration meets the WER and memory limits")
+    chosen = min(eligible, key=lambda c: (c["rtf"], c["peak_rss_mb"]))
+
+    return {
+        "host": host_fingerprint(),
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "config": {
+            "model_size": chosen["model_size"],
+            "compute_type": chosen["compute_type"],
+            "beam_size": chosen["beam_size"],
+            "cpu_threads": chosen["cpu_threads"],
+        },
+        "reference": reference_source,
+        "max_wer_increase": max_wer_increase,
+        "max_rss_mb": max_rss_mb,
+        "candidates": candidates,
+    }
+
+
+def print_report(profile: dict) -> None:
+    chosen = profile["config"]
+    print(f"\n[CALIBRATE] ===== Whisper calibration ({profile['host']['cpu_model']}, "
+          f"{profile['host']['cpu_count']} CPUs) =====")
+    print(f"[CALIBRATE] WER reference: {profile['reference']}")
+    print(f"[CALIBRATE] {'model':<8} {'compute':<13} {'beam':>4} {'thr':>4} {'RTF':>7} {'RSS MB':>8} {'WER':>7}")
+    for c in sorted(profile["candidates"], key=lambda c: c["rtf"]):
+        marker = " <- chosen" if all(c[k] == v for k, v in chosen.items()) else ""
+        wer = f"{c['wer']:.3f}" if c["wer"] is not None else "n/a"
+        print(f"[CALIBRATE] {c['model_size']:<8} {c['compute_type']:<13} {c['beam_size']:>4} "
+              f"{c['cpu_threads']:>4} {c['rtf']:>7.3f} {c['peak_rss_mb']:>8.0f} {wer:>7}{marker}")
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    cpus = os.cpu_count() or 2
+    parser = argparse.ArgumentParser(description="Benchmark Whisper configurations and write a host profile")
+    parser.add_argument("--models", default=DEFAULT_MODELS)
+    parser.add_argument("--compute-types", default=DEFAULT_COMPUTE_TYPES)
+    parser.add_argument("--beam-sizes", default=DEFAULT_BEAM_SIZES)
+    parser.add_argument("--threads", default=",".join(str(t) for t in sorted({max(1, cpus // 2), cpus})),
+                        help="CPU thread counts to try")
+    parser.add_argument("--audio-dir", default=SAMPLE_AUDIO_DIR)
+    parser.add_argument("--max-wer-increase", type=float, default=0.05,
+                        help="Allowed WER above the most accurate candidate (absolute)")
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    parser.add_argument("--out", default=WHISPER_PROFILE_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Print the result without writing the profile")
+    args = parser.parse_args()
+    configure_logging()
+
+    profile = calibrate(
+        models=[m.strip() for m in args.models.split(",") if m.strip()],
+        compute_types=[c.strip() for c in args.compute_types.split(",") if c.strip()],
+        beam_sizes=_int_list(args.beam_sizes),
+        threads=_int_list(args.threads),
+        audio_dir=args.audio_dir,
+        max_wer_increase=args.max_wer_increase,
+        max_rss_mb=args.max_rss_mb,
+    )
+    print_report(profile)
+    if not args.dry_run:
+        tmp_path = f"{args.out}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(profile, f, indent=2)
+        os.replace(tmp_path, args.out)
+        print(f"[CALIBRATE] Profile written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
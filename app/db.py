@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
 from .models import Base
+from .search import setup_fts
+from .aggregates import setup_aggregates
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./interview_logs.db"
 
@@ -9,9 +11,47 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while retention purges write; auto_vacuum only
+    # takes effect on a fresh database (see app.retention for converting old ones)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA busy_timeout = 5000")
+    cursor.close()
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# create_all never alters existing tables, so add columns introduced after
+# the database was first created (SQLite supports ADD COLUMN for nullable ones)
+def _add_missing_columns():
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+
+_add_missing_columns()
+
+# create_all skips indexes on tables that already exist, so add any new ones
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+# Full-text index over transcripts, kept in sync by triggers
+setup_fts(engine)
+
+# Dashboard summary tables, also kept in sync by triggers
+setup_aggregates(engine)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,178 @@
+"""
+CPU-only speaker diarization of transcript segments.
+
+Interview recordings mix the interviewer's questions with the candidate's
+answers. Each Whisper segment is summarised by the mean and spread of its
+MFCCs (a cheap numpy-only voice fingerprint), the segments are split into two
+clusters, and the speaker with the most speech time is taken to be the
+candidate. When the two clusters are not clearly distinct (a monologue, or
+one voice with varying intonation) every segment is kept as the candidate's.
+
+Only candidate turns are forwarded to the LLM extraction, which saves tokens
+and stops the interviewer's name or background being extracted.
+"""
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+from .preprocess import SAMPLE_RATE
+from .segments import CANDIDATE, INTERVIEWER, SegmentArray
+
+logger = logging.getLogger(__name__)
+
+N_FFT = 512
+WIN_LEN = SAMPLE_RATE * 25 // 1000
+HOP_LEN = SAMPLE_RATE * 10 // 1000
+N_MELS = 40
+N_MFCC = 20
+
+# Segments shorter than this give a noisy fingerprint; they are labelled but
+# do not pull the cluster centres around
+MIN_SEGMENT_SECONDS = 1.0
+# How far apart the two clusters must be, relative to their own spread,
+# before we believe there are two voices
+MIN_SEPARATION = float(os.getenv("DIARIZATION_MIN_SEPARATION", "30.0"))
+# ...and the quieter speaker must hold at least this share of the speech
+MIN_SPEAKER_SHARE = 0.08
+
+
+def _mel_filterbank(n_fft: int = N_FFT, n_mels: int = N_MELS, fmin: float = 60.0, fmax: float = 7600.0) -> np.ndarray:
+    def to_mel(f):
+        return 2595.0 * np.log10(1.0 + f / 700.0)
+
+    def to_hz(m):
+        return 700.0 * (10.0 ** (m / 2595.0) - 1.0)
+
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / SAMPLE_RATE)
+    points = to_hz(np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2))
+    lower, center, upper = points[:-2, None], points[1:-1, None], points[2:, None]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def _dct_matrix(n_out: int = N_MFCC, n_in: int = N_MELS) -> np.ndarray:
+    n = np.arange(n_in)
+    k = np.arange(n_out)[:, None]
+    basis = np.cos(np.pi / n_in * (n + 0.5) * k) * np.sqrt(2.0 / n_in)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+_FILTERBANK = _mel_filterbank()
+_DCT = _dct_matrix()
+_WINDOW = np.hanning(WIN_LEN).astype(np.float32)
+
+
+def mfcc(audio: np.ndarray) -> np.ndarray:
+    """MFCC frames (n_frames, N_MFCC) of 16 kHz audio, 25 ms windows every 10 ms"""
+    if len(audio) < WIN_LEN:
+        audio = np.pad(audio, (0, WIN_LEN - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, WIN_LEN)[::HOP_LEN]
+    power = np.abs(np.fft.rfft(frames * _WINDOW, n=N_FFT)) ** 2
+    log_mel = np.log(power @ _FILTERBANK.T + 1e-10)
+    return log_mel @ _DCT.T
+
+
+def segment_features(audio: np.ndarray, segments: SegmentArray) -> np.ndarray:
+    """One row per segment: mean and std of its MFCCs, energy (c0) excluded"""
+    features = np.zeros((len(segments), 2 * (N_MFCC - 1)), dtype=np.float32)
+    for i in range(len(segments)):
+        start = int(segments.start[i] * SAMPLE_RATE)
+        end = max(start + 1, int(segments.end[i] * SAMPLE_RATE))
+        coefficients = mfcc(audio[start:end])[:, 1:]
+        features[i] = np.concatenate([coefficients.mean(axis=0), coefficients.std(axis=0)])
+    return features
+
+
+def _two_means(x: np.ndarray, weights: np.ndarray, iterations: int = 25):
+    """Weighted 2-means with deterministic farthest-point seeding"""
+    centre = np.average(x, axis=0, weights=weights)
+    first = x[np.argmax(((x - centre) ** 2).sum(axis=1))]
+    second = x[np.argmax(((x - first) ** 2).sum(axis=1))]
+    centroids = np.stack([first, second])
+    labels = None
+    for _ in range(iterations):
+        distances = ((x[:, None, :] - centroids[None]) ** 2).sum(axis=2)
+        new_labels = distances.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in (0, 1):
+            if weights[labels == c].sum() == 0:
+                return None, None
+            centroids[c] = np.average(x[labels == c], axis=0, weights=weights[labels == c])
+    return labels, centroids
+
+
+def _separation(x: np.ndarray, weights: np.ndarray, labels: np.ndarray, centroids: np.ndarray) -> float:
+    """Fisher ratio of the two clusters projected onto the line between their centres"""
+    direction = centroids[1] - centroids[0]
+    norm = np.linalg.norm(direction)
+    if norm == 0:
+        return 0.0
+    projected = x @ (direction / norm)
+    means, variances = [], []
+    for c in (0, 1):
+        p, w = projected[labels == c], weights[labels == c]
+        mean = np.average(p, weights=w)
+        means.append(mean)
+        variances.append(np.average((p - mean) ** 2, weights=w))
+    return float((means[1] - means[0]) ** 2 / (variances[0] + variances[1] + 1e-6))
+
+
+def diarize(audio: np.ndarray, segments: SegmentArray) -> dict:
+    """
+    Label every segment CANDIDATE or INTERVIEWER (stored on segments.speakers)
+    and return speaking-time stats. `audio` is the original 16 kHz recording
+    the segment timestamps refer to.
+    """
+    durations = np.maximum(segments.end - segments.start, 0.0).astype(np.float64)
+    speakers = np.full(len(segments), CANDIDATE, dtype=np.uint8)
+    reliable = durations >= MIN_SEGMENT_SECONDS
+    separation = 0.0
+
+    if reliable.sum() >= 4:
+        features = segment_features(audio, segments)
+        # z-score each dimension so no single coefficient dominates the distance
+        mean = features[reliable].mean(axis=0)
+        std = features[reliable].std(axis=0) + 1e-6
+        x = (features - mean) / std
+
+        weights = np.where(reliable, durations, 0.0)
+        labels, centroids = _two_means(x[reliable], weights[reliable])
+        if labels is not None:
+            separation = _separation(x[reliable], weights[reliable], labels, centroids)
+            # short segments join whichever voice they sound closest to
+            all_labels = ((x[:, None, :] - centroids[None]) ** 2).sum(axis=2).argmin(axis=1)
+            talk = np.array([durations[all_labels == c].sum() for c in (0, 1)])
+            share = talk.min() / max(talk.sum(), 1e-6)
+            if separation >= MIN_SEPARATION and share >= MIN_SPEAKER_SHARE:
+                # the candidate does most of the talking in an interview
+                candidate = int(talk.argmax())
+                speakers = np.where(all_labels == candidate, CANDIDATE, INTERVIEWER).astype(np.uint8)
+
+    segments.speakers = speakers
+    candidate_seconds = float(durations[speakers == CANDIDATE].sum())
+    interviewer_seconds = float(durations[speakers == INTERVIEWER].sum())
+    logger.debug(
+        "Diarized %d segments: separation %.2f, candidate %.1fs, interviewer %.1fs",
+        len(segments), separation, candidate_seconds, interviewer_seconds,
+    )
+    return {
+        "speakers": 2 if interviewer_seconds > 0 else 1,
+        "candidate_seconds": round(candidate_seconds, 2),
+        "interviewer_seconds": round(interviewer_seconds, 2),
+    }
+
+
+def candidate_text(segments: Optional[SegmentArray], fallback: str = "") -> str:
+    """The candidate's turns joined together, or `fallback` when there is nothing to pick from"""
+    if segments is None or len(segments) == 0 or segments.speakers is None:
+        return fallback
+    text = " ".join(
+        segments.segment_text(i) for i in range(len(segments)) if segments.speakers[i] == CANDIDATE
+    ).strip()
+    return text or fallback
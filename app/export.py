@@ -0,0 +1,270 @@
+"""
+Streaming bulk export of interview logs to JSONL, CSV or Parquet.
+
+    python -m app.export --format parquet --out interviews.parquet
+    python -m app.export --format csv --skill Python --date-from 2024-01-01 > python.csv
+    GET /export?format=jsonl&fields=id,candidate_name,skills&role=backend
+
+Rows are read in id-ordered keyset batches, each in its own short read
+transaction, and written out batch by batch, so memory stays constant however
+large the table is and no long-running read holds up the WAL. skills and
+selected_faq are decoded once here: JSONL keeps them as arrays, Parquet as
+list columns, and CSV as JSON text in the cell. Parquet needs the optional
+pyarrow package.
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy.orm import load_only
+
+from .metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FORMATS = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Everything analytics may want; segments stay out (they are a binary
+# per-word timeline) and the transcription is only exported on request
+EXPORT_FIELDS = [
+    "id",
+    "filename",
+    "transcription",
+    "candidate_name",
+    "skills",
+    "years_experience",
+    "desired_role",
+    "selected_faq",
+    "timestamp",
+    "audio_hash",
+    "prompt_version",
+    "llm_model",
+    "extracted_at",
+]
+DEFAULT_EXPORT_FIELDS = [f for f in EXPORT_FIELDS if f != "transcription"]
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def parse_export_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma separated field list; id always comes first"""
+    if not fields:
+        return list(DEFAULT_EXPORT_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+
+def _faq_items(value) -> list:
+    # Older rows stored a dict, or nothing, in selected_faq
+    if not isinstance(value, list):
+        return []
+    return [
+        {"question": str(item.get("question", "")), "answer": str(item.get("answer", ""))}
+        for item in value
+        if isinstance(item, dict)
+    ]
+
+
+def _row(log, fields: List[str]) -> dict:
+    row = {}
+    for field in fields:
+        if field == "skills":
+            row[field] = [str(skill) for skill in log.get_skills() if skill is not None]
+        elif field == "selected_faq":
+            row[field] = _faq_items(log.get_selected_faq())
+        else:
+            row[field] = getattr(log, field)
+    return row
+
+
+def iter_batches(fields: List[str], batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> Iterator[List[dict]]:
+    """Yield lists of export rows, oldest first, one short-lived session per batch"""
+    from .db import SessionLocal
+    from .models import InterviewLog
+    from .queries import filter_interviews
+
+    columns = [getattr(InterviewLog, f) for f in fields]
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            query = filter_interviews(db.query(InterviewLog).options(load_only(*columns)), **filters)
+            logs = (
+                query.filter(InterviewLog.id > last_id)
+                .order_by(InterviewLog.id)
+                .limit(batch_size)
+                .all()
+            )
+            batch = [_row(log, fields) for log in logs]
+        finally:
+            db.close()
+        if not batch:
+            return
+        last_id = batch[-1]["id"]
+        yield batch
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _jsonl_chunks(batches, fields) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in batch
+        ).encode("utf-8")
+
+
+def _csv_cell(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(batches, fields) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_csv_cell(row[f]) for f in fields])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _arrow_schema(fields):
+    types = {
+        "id": pa.int64(),
+        "years_experience": pa.float64(),
+        "timestamp": pa.timestamp("us"),
+        "extracted_at": pa.timestamp("us"),
+        "skills": pa.list_(pa.string()),
+        "selected_faq": pa.list_(pa.struct([("question", pa.string()), ("answer", pa.string())])),
+    }
+    return pa.schema([(f, types.get(f, pa.string())) for f in fields])
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_chunks(batches, fields) -> Iterator[bytes]:
+    # One row group per batch; the footer is written when the last batch is in
+    schema = _arrow_schema(fields)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_WRITERS = {"jsonl": _jsonl_chunks, "csv": _csv_chunks, "parquet": _parquet_chunks}
+
+
+def check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose one of {', '.join(FORMATS)}")
+    if fmt == "parquet" and pq is None:
+        raise ValueError("Parquet export requires the optional pyarrow package")
+
+
+def export_chunks(fmt: str, fields: List[str], batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> Iterator[bytes]:
+    """Encoded export of the matching rows, as a stream of byte chunks"""
+    check_format(fmt)
+    return _WRITERS[fmt](iter_batches(fields, batch_size, **filters), fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export interview logs to JSONL, CSV or Parquet")
+    parser.add_argument("--format", choices=list(FORMATS), default="jsonl")
+    parser.add_argument("--out", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--fields", default=None, help=f"Comma separated subset of: {', '.join(EXPORT_FIELDS)}")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--skill")
+    parser.add_argument("--role")
+    parser.add_argument("--min-years", type=int)
+    parser.add_argument("--date-from", type=datetime.fromisoformat)
+    parser.add_argument("--date-to", type=datetime.fromisoformat)
+    args = parser.parse_args()
+    configure_logging()
+
+    try:
+        fields = parse_export_fields(args.fields)
+        chunks = export_chunks(
+            args.format,
+            fields,
+            batch_size=args.batch_size,
+            skill=args.skill,
+            role=args.role,
+            min_years=args.min_years,
+            date_from=args.date_from,
+            date_to=args.date_to,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    written = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    logger.info("Exported %d bytes of %s", written, args.format)
+
+
+if __name__ == "__main__":
+    main()
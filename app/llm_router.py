@@ -0,0 +1,176 @@
+"""
+Per-call choice of LLM model, by task, prompt size and latency budget.
+
+Call sites name their task ("extract", "manual_faq") and pass the prompt;
+routes are tried from cheapest to most capable, and the first one that is
+adequate for the task and prompt size and whose predicted latency fits the
+budget serves the call. The budget is also passed to the client as a request
+timeout. When no route fits, or the chosen one fails, the call site runs its
+local rule-based path instead (LOCAL_MODEL).
+
+Predicted latency is overhead + seconds_per_1k_tokens * prompt tokens. Both
+start from the configured priors and follow an EWMA of observed calls, so
+routing adapts to how the models actually behave from this host; a route
+that keeps failing is skipped for a while.
+
+Configuration (environment):
+    LLM_ROUTES              "model:tier:overhead_s:s_per_1k_tokens,..." cheapest first
+                            (default: EXTRACTION_MODEL alone, so extraction quality
+                            is unchanged unless a cheaper tier is opted into, e.g.
+                            "gemini-1.5-flash-8b:1:0.6:0.10,gemini-1.5-flash:2:1.0:0.20")
+    LLM_LONG_PROMPT_TOKENS  prompts above this need a tier 2 model (default 6000)
+    LLM_BUDGET_EXTRACT, LLM_BUDGET_MANUAL_FAQ
+                            default latency budgets in seconds (60, 15)
+"""
+import logging
+import math
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from .metrics import stage_span
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_MODEL = os.getenv("EXTRACTION_MODEL", "gemini-1.5-flash")
+LOCAL_MODEL = "rules"
+
+DEFAULT_ROUTES = f"{EXTRACTION_MODEL}:2:1.0:0.20"
+LONG_PROMPT_TOKENS = int(os.getenv("LLM_LONG_PROMPT_TOKENS", "6000"))
+TASK_MIN_TIER = {"extract": 1, "manual_faq": 1}
+DEFAULT_BUDGETS = {
+    "extract": float(os.getenv("LLM_BUDGET_EXTRACT", "60")),
+    "manual_faq": float(os.getenv("LLM_BUDGET_MANUAL_FAQ", "15")),
+}
+
+EWMA_ALPHA = 0.2
+MAX_ERROR_RATE = 0.5
+ERROR_COOLDOWN_SECONDS = 30.0
+
+ROUTE_TOTAL = Counter("llm_route_total", "LLM calls by task, route and outcome", ["task", "model", "status"])
+ROUTE_OVERHEAD_SECONDS = Gauge(
+    "llm_route_overhead_seconds", "Current per-call overhead estimate of an LLM route", ["model"]
+)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English; close enough to rank routes
+    return len(text) // 4 + 1
+
+
+class Route:
+    def __init__(self, model: str, tier: int, overhead: float, per_ktok: float):
+        self.model = model
+        self.tier = tier
+        self.overhead = overhead
+        self.per_ktok = per_ktok
+        self.error_rate = 0.0
+        self.last_failure = 0.0
+
+    def predict(self, tokens: int) -> float:
+        return self.overhead + self.per_ktok * tokens / 1000
+
+    def available(self, now: float) -> bool:
+        # A failing route is retried once the cooldown has passed
+        return self.error_rate <= MAX_ERROR_RATE or now - self.last_failure > ERROR_COOLDOWN_SECONDS
+
+    def __repr__(self):
+        return f"Route({self.model}, tier={self.tier})"
+
+
+def parse_routes(spec: str) -> List[Route]:
+    routes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model, tier, overhead, per_ktok = item.rsplit(":", 3)
+        routes.append(Route(model, int(tier), float(overhead), float(per_ktok)))
+    return routes
+
+
+class LLMRouter:
+    def __init__(self, routes: List[Route]):
+        self.routes = routes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LLMRouter":
+        return cls(parse_routes(os.getenv("LLM_ROUTES", DEFAULT_ROUTES)))
+
+    def models(self) -> List[str]:
+        return [route.model for route in self.routes]
+
+    def budget_for(self, task: str) -> float:
+        return DEFAULT_BUDGETS.get(task, math.inf)
+
+    def choose(self, task: str, tokens: int, budget: float) -> Optional[Route]:
+        """Cheapest adequate route predicted to finish within `budget`, or None for the local path"""
+        min_tier = TASK_MIN_TIER.get(task, 1)
+        if tokens > LONG_PROMPT_TOKENS:
+            min_tier = max(min_tier, 2)
+        now = time.monotonic()
+        with self._lock:
+            for route in self.routes:
+                if route.tier >= min_tier and route.available(now) and route.predict(tokens) <= budget:
+                    return route
+        return None
+
+    def record(self, task: str, route: Route, tokens: int, seconds: float, ok: bool) -> None:
+        ROUTE_TOTAL.labels(task, route.model, "ok" if ok else "error").inc()
+        with self._lock:
+            route.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - route.error_rate)
+            if not ok:
+                route.last_failure = time.monotonic()
+                return
+            ktok = tokens / 1000
+            if ktok >= 1:
+                observed = max(0.0, (seconds - route.overhead) / ktok)
+                route.per_ktok += EWMA_ALPHA * (observed - route.per_ktok)
+            observed = max(0.0, seconds - route.per_ktok * ktok)
+            route.overhead += EWMA_ALPHA * (observed - route.overhead)
+            ROUTE_OVERHEAD_SECONDS.labels(route.model).set(route.overhead)
+
+    def complete(
+        self,
+        task: str,
+        prompt: str,
+        latency_budget: Optional[float] = None,
+        generation_config: Optional[dict] = None,
+    ) -> Tuple[Optional[str], Optional[Route]]:
+        """
+        Run `prompt` on the routed model. Returns (text, route); text is None
+        when the caller should fall back to its local path (no route fits
+        the budget, or the call failed or timed out).
+        """
+        budget = self.budget_for(task) if latency_budget is None else latency_budget
+        tokens = estimate_tokens(prompt)
+        route = self.choose(task, tokens, budget)
+        if route is None:
+            ROUTE_TOTAL.labels(task, LOCAL_MODEL, "fallback").inc()
+            logger.info("No LLM route for %s (%d tokens) within %.1fs; using local path", task, tokens, budget)
+            return None, None
+
+        import google.generativeai as genai
+
+        request_options = {"timeout": budget} if math.isfinite(budget) else None
+        start = time.perf_counter()
+        try:
+            with stage_span("llm", task=task, model=route.model, prompt_chars=len(prompt)) as span:
+                response = genai.GenerativeModel(route.model).generate_content(
+                    prompt, generation_config=generation_config, request_options=request_options
+                )
+                text = response.text
+                span["response_chars"] = len(text or "")
+        except Exception as e:
+            self.record(task, route, tokens, time.perf_counter() - start, ok=False)
+            logger.warning("LLM call on %s failed for %s: %s", route.model, task, e)
+            return None, route
+        self.record(task, route, tokens, time.perf_counter() - start, ok=True)
+        return text, route
+
+
+router = LLMRouter.from_env()
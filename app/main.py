@@ -4,22 +4,53 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", message=".*pkg_resources.*")
 warnings.filterwarnings("ignore", message=".*pkg_resources is deprecated.*")
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Body
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Body, Query, BackgroundTasks, Request, Header
+from fastapi.responses import JSONResponse, Response, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from datetime import datetime
-from .audio_utils import transcribe_audio, get_whisper_model
-from .nlp import extract_entities
-from .tts import text_to_speech
-from .db import get_db
+from .audio_utils import transcribe_audio_with_details, get_whisper_model
+from . import model_server
+from .nlp import extract_entities, extraction_version, answer_question, answer_questions
+from .llm_router import LOCAL_MODEL
+from .tts import text_to_speech, VOICE
+from .db import get_db, SessionLocal
 from .models import InterviewLog
+from .queries import parse_fields, list_interviews, get_interview, INTERVIEW_FIELDS
+from .schemas import InterviewLogPage
+from .export import FORMATS, parse_export_fields, export_chunks
+from .aggregates import read_stats
+from .search import search_transcripts
+from .semantic import semantic_search, similar_interviews, index_interview_by_id
+from .retention import retention_loop, RetentionPolicy
+from .metrics import (
+    configure_logging, stage_span, render_metrics, request_id_var, new_request_id,
+    HTTP_SECONDS, HTTP_IN_PROGRESS,
+)
+from .sample_cache import sample_cache
+from .singleflight import analysis_flight, tts_flight
+from .responses import (
+    FastJSONResponse, JSONCompressionMiddleware, serve_file, content_address, is_content_addressed,
+)
+from .scheduler import (
+    whisper_scheduler, llm_scheduler, SchedulerBusy, tenant_id, resolve_priority,
+    INTERACTIVE, UPLOAD, BATCH, ANONYMOUS,
+)
+from .profiling import sample_stacks, to_folded, ProfilerBusy, install_profile_signal, LoopLagMonitor
 from sqlalchemy.orm import Session
+from typing import Optional
 import asyncio
+import hashlib
+import hmac
+import logging
+import time
 import requests
 import google.generativeai as genai
 
-app = FastAPI()
+configure_logging()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Initialize Gemini AI
 import os
@@ -31,8 +62,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 env_path = os.path.join(project_root, '.env')
 
-print(f"🔍 Loading .env from: {env_path}")
-print(f"📁 .env exists: {os.path.exists(env_path)}")
+logger.info("🔍 Loading .env from: %s (exists: %s)", env_path, os.path.exists(env_path))
 
 # Load .env file from the correct path
 load_dotenv(env_path)
@@ -43,25 +73,85 @@ if not api_key:
     # Try with BOM character (Windows UTF-8 issue)
     api_key = os.getenv("\ufeffGOOGLE_API_KEY")
     if api_key:
-        print(f"✅ Found API key with BOM: {api_key[:10]}...")
+        logger.info("✅ Found API key with BOM")
     else:
-        print(f"❌ API key not found in environment")
-        print(f"🔍 Available env vars: {[k for k in os.environ.keys() if 'GOOGLE' in k]}")
+        logger.error("❌ API key not found in environment")
+        logger.error("🔍 Available env vars: %s", [k for k in os.environ.keys() if 'GOOGLE' in k])
         raise ValueError("GOOGLE_API_KEY environment variable not set. Please set it in your .env file or environment.")
 
 if not api_key:
     raise ValueError("GOOGLE_API_KEY environment variable not set. Please set it in your .env file or environment.")
 
-print(f"✅ API key loaded: {api_key[:10]}...")
+logger.info("✅ API key loaded")
 genai.configure(api_key=api_key)
 
+# Strong references to startup tasks; the loop itself only keeps weak ones
+_background_tasks = set()
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 # Preload Whisper model on startup to avoid delays during first transcription
 @app.on_event("startup")
 async def startup_event():
-    print("🚀 Starting AI Interview Backend...")
-    print("📝 Preloading Whisper model for faster transcription...")
-    get_whisper_model()  # This will load the model once on startup
-    print("✅ Backend startup complete!")
+    logger.info("🚀 Starting AI Interview Backend...")
+    if model_server.enabled():
+        # Models live in the shared model server process, see app/model_server.py
+        logger.info("🔌 Using model server at %s", model_server.MODEL_SERVER_ADDRESS)
+        model_server.require_authkey()  # refuse to start with an unauthenticated socket
+        try:
+            await asyncio.to_thread(model_server.call, "ping")
+        except model_server.ModelServerError as e:
+            logger.warning("Model server not reachable yet: %s", e)
+    else:
+        logger.info("📝 Preloading Whisper model for faster transcription...")
+        get_whisper_model()  # This will load the model once on startup
+    retention_hours = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+    if retention_hours > 0 and not RetentionPolicy.from_env().is_empty():
+        logger.info("🧹 Retention sweep scheduled every %sh", retention_hours)
+        _spawn(retention_loop(retention_hours))
+    if os.getenv("SAMPLE_CACHE_WARMUP", "1") == "1":
+        _spawn(warm_sample_cache())
+    # Opt-in diagnostics, see app/profiling.py
+    if os.getenv("PROFILE_ON_SIGNAL") == "1" and install_profile_signal():
+        logger.info("🔬 Send SIGUSR2 to write a sampling profile to ./profiles")
+    lag_threshold_ms = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "0"))
+    if lag_threshold_ms > 0:
+        LoopLagMonitor(lag_threshold_ms / 1000).start()
+        logger.info("🔬 Event-loop lag monitor enabled (%.0f ms)", lag_threshold_ms)
+    logger.info("✅ Backend startup complete!")
+
+@app.exception_handler(SchedulerBusy)
+async def scheduler_busy_handler(request: Request, exc: SchedulerBusy):
+    # Queue quota exhausted: shed load instead of queueing without bound
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Tag the request with an id (echoed back as X-Request-ID) and record its latency"""
+    request_id = request.headers.get("X-Request-ID") or new_request_id()
+    token = request_id_var.set(request_id)
+    HTTP_IN_PROGRESS.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        HTTP_IN_PROGRESS.dec()
+        route = request.scope.get("route")
+        HTTP_SECONDS.labels(
+            request.method, route.path if route else "unmatched", str(status)
+        ).observe(time.perf_counter() - start)
+        request_id_var.reset(token)
+
+# gzip/brotli for JSON bodies; audio is served uncompressed with range support
+app.add_middleware(JSONCompressionMiddleware)
 
 # Add CORS middleware to allow browser requests
 app.add_middleware(
@@ -79,6 +169,11 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(SAMPLE_AUDIO_DIR, exist_ok=True)
 os.makedirs(AUDIO_RESP_DIR, exist_ok=True)
 
+# Batch endpoint limits; TTS_CONCURRENCY caps edge-tts calls across all requests
+MAX_BATCH_QUESTIONS = int(os.getenv("MAX_BATCH_QUESTIONS", "20"))
+MAX_TTS_BATCH = int(os.getenv("MAX_TTS_BATCH", "32"))
+tts_semaphore = asyncio.Semaphore(int(os.getenv("TTS_CONCURRENCY", "4")))
+
 # Sample audio files for testing
 SAMPLE_AUDIO_FILES = {
     "ananya": {
@@ -106,6 +201,12 @@ async def root():
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/sample-audio-files")
 async def get_sample_audio_files():
     """Get list of available sample audio files for testing"""
@@ -115,7 +216,7 @@ async def get_sample_audio_files():
     }
 
 @app.get("/sample-audio/{sample_id}")
-async def get_sample_audio(sample_id: str):
+async def get_sample_audio(sample_id: str, request: Request):
     """Serve a specific sample audio file"""
     if sample_id not in SAMPLE_AUDIO_FILES:
         raise HTTPException(status_code=404, detail="Sample audio file not found")
@@ -124,13 +225,136 @@ async def get_sample_audio(sample_id: str):
     file_path = os.path.join(SAMPLE_AUDIO_DIR, filename)
     
     if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="audio/wav", filename=filename)
+        return await asyncio.to_thread(serve_file, request, file_path, "audio/wav", filename)
     else:
         raise HTTPException(status_code=404, detail="Sample audio file not found on server")
 
+def _log_interview(log_filename: str, audio_hash: Optional[str], transcription: str, analysis_data: dict, segments) -> Optional[int]:
+    """Store one analysed interview; returns its id, or None if the DB write failed"""
+    # Runs in a worker thread (possibly on behalf of several coalesced
+    # requests), so it uses its own DB session rather than a request's
+    db = SessionLocal()
+    try:
+        log = InterviewLog(
+            filename=log_filename,
+            audio_hash=audio_hash,
+            transcription=transcription,
+        )
+        log.set_extraction(analysis_data, **extraction_version(analysis_data))
+        log.set_segments(segments)
+        with stage_span("db_commit"):
+            db.add(log)
+            db.commit()
+            db.refresh(log)
+        return log.id
+    except Exception as db_error:
+        logger.warning("Database error (non-critical): %s", db_error)
+        return None
+    finally:
+        db.close()
+
+async def _analyze_audio(
+    file_path: str,
+    log_filename: str,
+    audio_hash: Optional[str],
+    priority: int = UPLOAD,
+    tenant: str = ANONYMOUS,
+    content: Optional[bytes] = None,
+) -> dict:
+    """
+    Transcribe, extract and log one recording; returns the analysis payload.
+    Whisper and the LLM each wait for a scheduler slot, so interactive
+    requests overtake batch work. `content`, when given, is written to
+    file_path first.
+    """
+    if content is not None:
+        def write_upload():
+            with stage_span("upload_write", bytes=len(content)):
+                with open(file_path, "wb") as f:
+                    f.write(content)
+        await asyncio.to_thread(write_upload)
+
+    async with whisper_scheduler.slot(priority, tenant):
+        transcribed = await asyncio.to_thread(transcribe_audio_with_details, file_path)
+    transcription = transcribed["text"]
+    if not transcription:
+        raise HTTPException(status_code=500, detail="Transcription failed")
+
+    # Single call to get entities and dynamic FAQs text; interviewer
+    # turns are left out so they neither cost tokens nor get extracted
+    async with llm_scheduler.slot(priority, tenant):
+        analysis_data = await asyncio.to_thread(extract_entities, transcribed["candidate_text"])
+
+    # Add the transcription to the response data so the frontend can access it
+    analysis_data['transcription'] = transcription
+    # Duration, speech kept and silence removed before Whisper
+    analysis_data['audio_stats'] = transcribed["audio_stats"]
+    # Timestamped segments (and words, when enabled) for seeking in the audio
+    segments = transcribed["segments"]
+    analysis_data['segments'] = segments.to_list() if segments is not None else []
+
+    analysis_data["session_id"] = await asyncio.to_thread(
+        _log_interview, log_filename, audio_hash, transcription, analysis_data, segments
+    )
+    return analysis_data
+
+async def _analyze_sample(sample_id: str, file_path: str, tenant: str = ANONYMOUS):
+    """
+    Run the full pipeline on a sample clip and log it, coalesced with any
+    identical run in flight; returns (analysis payload, shared)
+    """
+    filename = SAMPLE_AUDIO_FILES[sample_id]["filename"]
+    audio_hash = await asyncio.to_thread(sample_cache.audio_hash, file_path)
+    # Sample runs are demo/background work and yield to real users
+    analysis_data, shared = await analysis_flight.do(
+        audio_hash, _analyze_audio, file_path, f"sample_{sample_id}_{filename}", audio_hash, BATCH, tenant
+    )
+    analysis_data = {
+        **analysis_data,
+        "sample_file_used": sample_id,
+        "sample_description": SAMPLE_AUDIO_FILES[sample_id]["description"],
+    }
+    return analysis_data, shared
+
+def _is_cacheable(analysis_data: dict) -> bool:
+    # Don't pin a failed transcription, an empty LLM answer or a rule-based
+    # stand-in into the cache
+    return (
+        not analysis_data["transcription"].startswith("Audio transcription failed")
+        and bool(analysis_data.get("faq"))
+        and analysis_data.get("llm_model") != LOCAL_MODEL
+    )
+
+async def warm_sample_cache():
+    """Precompute any missing or stale sample results without blocking startup"""
+    for sample_id, details in SAMPLE_AUDIO_FILES.items():
+        file_path = os.path.join(SAMPLE_AUDIO_DIR, details["filename"])
+        if not os.path.exists(file_path):
+            continue
+        if await asyncio.to_thread(sample_cache.get, sample_id, file_path) is not None:
+            continue
+        try:
+            analysis_data, shared = await _analyze_sample(sample_id, file_path)
+            if _is_cacheable(analysis_data):
+                await asyncio.to_thread(sample_cache.put, sample_id, file_path, analysis_data)
+                logger.info("Sample cache warmed for %s", sample_id)
+            if analysis_data["session_id"] is not None and not shared:
+                await asyncio.to_thread(index_interview_by_id, analysis_data["session_id"])
+        except Exception as e:
+            logger.warning("Could not precompute sample %s: %s", sample_id, e)
+
 @app.post("/test-sample-audio/{sample_id}")
-async def test_sample_audio(sample_id: str, db: Session = Depends(get_db)):
-    """Test the system with a specific sample audio file"""
+async def test_sample_audio(
+    sample_id: str,
+    background_tasks: BackgroundTasks,
+    refresh: bool = False,
+    x_api_key: Optional[str] = Header(None),
+):
+    """
+    Test the system with a specific sample audio file.
+    Results are served from the precomputed sample cache; pass ?refresh=true
+    to force the full pipeline to run again.
+    """
     if sample_id not in SAMPLE_AUDIO_FILES:
         raise HTTPException(status_code=404, detail="Sample audio file not found")
     
@@ -139,134 +363,164 @@ async def test_sample_audio(sample_id: str, db: Session = Depends(get_db)):
     
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Sample audio file not found on server")
+
+    if not refresh:
+        cached = await asyncio.to_thread(sample_cache.get, sample_id, file_path)
+        if cached is not None:
+            return FastJSONResponse(content={**cached, "cached": True})
     
     try:
-        # Process the sample audio file
-        transcription = transcribe_audio(file_path)
-        if not transcription:
-            raise HTTPException(status_code=500, detail="Transcription failed")
-
-        # Extract entities and generate FAQs
-        analysis_data = extract_entities(transcription)
-        analysis_data['transcription'] = transcription
-        analysis_data['sample_file_used'] = sample_id
-        analysis_data['sample_description'] = SAMPLE_AUDIO_FILES[sample_id]["description"]
-
-        # Log to DB
-        try:
-            log = InterviewLog(
-                filename=f"sample_{sample_id}_{filename}",
-                transcription=transcription,
-                candidate_name=analysis_data.get("candidate_name"),
-                years_experience=analysis_data.get("years_experience"),
-                desired_role=analysis_data.get("desired_role")
-            )
-            log.set_skills(analysis_data.get("skills", []))
-            log.set_selected_faq(analysis_data.get("faq", []))
-            db.add(log)
-            db.commit()
-            db.refresh(log)
-            analysis_data["session_id"] = log.id
-        except Exception as db_error:
-            print(f"Database error (non-critical): {db_error}")
-            analysis_data["session_id"] = None
+        analysis_data, shared = await _analyze_sample(sample_id, file_path, tenant_id(x_api_key))
+        # Only the request that actually ran the pipeline indexes and caches
+        if not shared:
+            if analysis_data["session_id"] is not None:
+                background_tasks.add_task(index_interview_by_id, analysis_data["session_id"])
+            if _is_cacheable(analysis_data):
+                await asyncio.to_thread(sample_cache.put, sample_id, file_path, analysis_data)
         
-        return JSONResponse(content=analysis_data)
+        return FastJSONResponse(content={**analysis_data, "cached": False})
         
+    except (HTTPException, SchedulerBusy):
+        raise
     except Exception as e:
-        print(f"Error processing sample audio: {e}")
+        logger.error("Error processing sample audio: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing sample audio: {str(e)}")
 
 @app.post("/upload-audio-json/")
-async def upload_audio_json(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_audio_json(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    x_api_key: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None),
+):
     """
     Main endpoint to process audio. It performs transcription and gets entities 
     and dynamic FAQs from Ollama in a single step. No audio is generated here.
+    Identical audio already being analysed (a double submit) shares that run.
+    Bulk clients should send `X-Priority: batch` so they yield to live users.
     """
     try:
         timestamp_base = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
         filename = f"{timestamp_base}_{file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        transcription = transcribe_audio(file_path)
-        if not transcription:
-            raise HTTPException(status_code=500, detail="Transcription failed")
 
-        # Single call to get entities and dynamic FAQs text
-        analysis_data = extract_entities(transcription)
-
-        # Add the transcription to the response data so the frontend can access it
-        analysis_data['transcription'] = transcription
-
-        # Log to DB
-        try:
-            log = InterviewLog(
-                filename=filename,
-                transcription=transcription,
-                candidate_name=analysis_data.get("candidate_name"),
-                years_experience=analysis_data.get("years_experience"),
-                desired_role=analysis_data.get("desired_role")
-            )
-            log.set_skills(analysis_data.get("skills", []))
-            log.set_selected_faq(analysis_data.get("faq", []))
-            db.add(log)
-            db.commit()
-            db.refresh(log)
-            analysis_data["session_id"] = log.id
-        except Exception as db_error:
-            print(f"Database error (non-critical): {db_error}")
-            analysis_data["session_id"] = None
+        content = await file.read()
+        audio_hash = hashlib.sha256(content).hexdigest()
+
+        # Only the first of several concurrent identical uploads writes its file
+        # and runs the pipeline; the others await it and get its session_id
+        analysis_data, shared = await analysis_flight.do(
+            audio_hash, _analyze_audio, os.path.join(UPLOAD_DIR, filename), filename, audio_hash,
+            resolve_priority(UPLOAD, x_priority), tenant_id(x_api_key), content,
+        )
+        if analysis_data["session_id"] is not None and not shared:
+            background_tasks.add_task(index_interview_by_id, analysis_data["session_id"])
         
-        return JSONResponse(content=analysis_data)
+        return FastJSONResponse(content=analysis_data)
         
+    except (HTTPException, SchedulerBusy):
+        raise
     except Exception as e:
-        print(f"Unexpected error in upload_audio_json: {e}")
+        logger.error("Unexpected error in upload_audio_json: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/answer-manual-faq/")
-async def answer_manual_faq(payload: dict = Body(...)):
+async def answer_manual_faq(payload: dict = Body(...), x_api_key: Optional[str] = Header(None)):
     """
     Answers a manually entered question from HR based on the transcription.
+    An optional "latency_budget" (seconds) overrides the default; when no LLM
+    route fits it the answer is quoted from the transcript instead.
     """
     transcription = payload.get("transcription")
     question = payload.get("question")
     if not transcription or not question:
         raise HTTPException(status_code=400, detail="Transcription and question are required.")
 
-    prompt = (
-        "You are an AI assistant. Based *only* on the provided transcript, answer the following question. "
-        "Keep the answer concise and factual.\n\n"
-        f"Transcript: \"{transcription}\"\n\n"
-        f"Question: \"{question}\"\n\n"
-        "Answer:"
-    )
+    try:
+        latency_budget = float(payload["latency_budget"]) if payload.get("latency_budget") is not None else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="latency_budget must be a number of seconds.")
 
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        
-        if response.text:
-            answer = response.text.strip()
-        else:
-            answer = "Could not generate an answer from the transcript."
-        
-        return {"answer": answer}
+        # HR is waiting on this one, so it jumps ahead of uploads and batch work
+        async with llm_scheduler.slot(INTERACTIVE, tenant_id(x_api_key)):
+            return await asyncio.to_thread(answer_question, transcription, question, latency_budget)
+    except SchedulerBusy:
+        raise
     except Exception as e:
-        print(f"Error calling Gemini for manual FAQ: {e}")
+        logger.error("Error answering manual FAQ: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get an answer from the AI model.")
 
+@app.post("/answer-manual-faq/batch")
+async def answer_manual_faq_batch(payload: dict = Body(...), x_api_key: Optional[str] = Header(None)):
+    """
+    Answers several HR questions about one transcript with a single LLM call,
+    so the transcript travels and is billed once instead of once per question.
+    Returns {"answers": [{"question", "answer", "llm_model"}, ...]} in input order.
+    """
+    transcription = payload.get("transcription")
+    questions = payload.get("questions")
+    if not transcription or not isinstance(questions, list) or not questions:
+        raise HTTPException(status_code=400, detail="Transcription and a list of questions are required.")
+    questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()]
+    if not questions:
+        raise HTTPException(status_code=400, detail="Questions must be non-empty strings.")
+    if len(questions) > MAX_BATCH_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUESTIONS} questions per batch.")
+    try:
+        latency_budget = float(payload["latency_budget"]) if payload.get("latency_budget") is not None else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="latency_budget must be a number of seconds.")
+
+    # Repeated questions are asked once
+    unique = list(dict.fromkeys(questions))
+    try:
+        async with llm_scheduler.slot(INTERACTIVE, tenant_id(x_api_key), cost=len(unique)):
+            answered = await asyncio.to_thread(answer_questions, transcription, unique, latency_budget)
+    except SchedulerBusy:
+        raise
+    except Exception as e:
+        logger.error("Error answering manual FAQ batch: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to get answers from the AI model.")
+    by_question = {item["question"]: item for item in answered}
+    return {"answers": [by_question[q] for q in questions]}
+
 @app.get("/audio/{filename}")
-async def get_audio(filename: str):
-    """Serve audio files"""
+async def get_audio(filename: str, request: Request):
+    """Serve audio files (ETag, byte ranges; content-addressed files are immutable)"""
     file_path = os.path.join(AUDIO_RESP_DIR, filename)
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="audio/mpeg")
+    if os.path.basename(filename) == filename and os.path.isfile(file_path):
+        return await asyncio.to_thread(
+            serve_file, request, file_path, "audio/mpeg", immutable=is_content_addressed(filename)
+        )
     raise HTTPException(status_code=404, detail="Audio file not found")
 
+async def _synthesize_to(text: str, tts_path: str) -> None:
+    async with tts_semaphore:
+        if os.path.exists(tts_path):
+            return  # written by a run that finished while this one queued
+        # Write under a unique name and swap it in, so readers never see a
+        # half-written file; a failed synthesis leaves nothing behind
+        tmp_path = f"{tts_path}.{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}.tmp"
+        try:
+            await text_to_speech(text, tmp_path)
+            os.replace(tmp_path, tts_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+async def _synthesize(text: str) -> str:
+    """Speak `text` (once) and return its /audio URL"""
+    # Named after what it says, so the same answer is synthesized once and
+    # its URL can be cached by clients forever. Concurrent requests for the
+    # same file share one in-flight synthesis.
+    tts_filename = f"tts_{content_address(VOICE, text)}.mp3"
+    tts_path = os.path.join(AUDIO_RESP_DIR, tts_filename)
+
+    if not os.path.exists(tts_path):
+        await tts_flight.do(tts_path, _synthesize_to, text, tts_path)
+
+    return f"/audio/{tts_filename}"
+
 @app.post("/tts-for-faq/")
 async def tts_for_faq(payload: dict = Body(...)):
     """
@@ -280,14 +534,194 @@ async def tts_for_faq(payload: dict = Body(...)):
         answer = faq_object.get("answer")
         if not answer:
             raise HTTPException(status_code=400, detail="FAQ object must contain an 'answer' key.")
-            
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-        tts_filename = f"tts_{timestamp}_faq.mp3"
-        tts_path = os.path.join(AUDIO_RESP_DIR, tts_filename)
-        
-        await text_to_speech(answer, tts_path)
-        
-        return {"audio_url": f"/audio/{tts_filename}"}
+
+        return {"audio_url": await _synthesize(answer)}
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in tts_for_faq: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate TTS audio.") 
\ No newline at end of file
+        logger.error("Error in tts_for_faq: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to generate TTS audio.") 
+
+@app.post("/tts/batch")
+async def tts_batch(payload: dict = Body(...)):
+    """
+    Synthesizes many texts concurrently (at most TTS_CONCURRENCY at a time).
+    Returns {"results": [{"audio_url", "error"}, ...]} in input order; one
+    failed text does not fail the others.
+    """
+    texts = payload.get("texts")
+    if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+        raise HTTPException(status_code=400, detail="Payload must contain a non-empty 'texts' list of strings.")
+    if len(texts) > MAX_TTS_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TTS_BATCH} texts per batch.")
+
+    unique = list(dict.fromkeys(texts))
+    outcomes = await asyncio.gather(*(_synthesize(text) for text in unique), return_exceptions=True)
+    by_text = {}
+    for text, outcome in zip(unique, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Error in tts_batch: %s", outcome)
+            by_text[text] = {"audio_url": None, "error": "Failed to generate TTS audio."}
+        else:
+            by_text[text] = {"audio_url": outcome, "error": None}
+    return {"results": [by_text[text] for text in texts]}
+
+@app.get("/interviews", response_model=InterviewLogPage)
+def get_interviews(
+    skill: Optional[str] = None,
+    role: Optional[str] = None,
+    min_years: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    List interview logs newest first with keyset pagination.
+    Pass the returned next_cursor back as ?cursor= to fetch the following page.
+    """
+    try:
+        selected_fields = parse_fields(fields)
+        return list_interviews(
+            db,
+            selected_fields,
+            limit=limit,
+            cursor=cursor,
+            skill=skill,
+            role=role,
+            min_years=min_years,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/stats")
+def stats(
+    top: int = Query(20, ge=1, le=200),
+    days: int = Query(30, ge=1, le=3660),
+    db: Session = Depends(get_db),
+):
+    """
+    Hiring dashboard numbers: total interviews, top skills and roles, the
+    experience histogram and daily volume. Served from trigger-maintained
+    summary tables, so the cost does not grow with the number of interviews.
+    """
+    return read_stats(db, top=top, days=days)
+
+@app.get("/export")
+async def export_interviews(
+    format: str = "jsonl",
+    fields: Optional[str] = None,
+    skill: Optional[str] = None,
+    role: Optional[str] = None,
+    min_years: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """
+    Stream every matching interview log as JSONL, CSV or Parquet (format=).
+    Rows are read and encoded in batches, so memory stays flat for any table size.
+    """
+    try:
+        chunks = export_chunks(
+            format,
+            parse_export_fields(fields),
+            skill=skill,
+            role=role,
+            min_years=min_years,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filename = f"interviews_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{format}"
+    # A sync iterator, so Starlette pulls each batch from a worker thread
+    return StreamingResponse(
+        chunks, media_type=FORMATS[format], headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/interviews/{log_id}")
+def get_interview_by_id(log_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Fetch a single interview log, including the transcription unless fields says otherwise"""
+    try:
+        selected_fields = parse_fields(fields) if fields else list(INTERVIEW_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    item = get_interview(db, log_id, selected_fields)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return item
+
+@app.get("/search")
+def search(q: str, limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db)):
+    """Full-text search over transcripts, candidate names, roles and skills"""
+    return {"query": q, "results": search_transcripts(db, q, limit=limit)}
+
+@app.get("/search/semantic")
+def search_semantic(
+    q: Optional[str] = None,
+    similar_to: Optional[int] = None,
+    k: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    Natural-language candidate search (?q=backend engineers who scaled Postgres)
+    or "more like this" search (?similar_to=<interview id>).
+    A plain def, so FastAPI runs it in its threadpool: loading the sentence
+    model, embedding the query, Chroma and the DB lookup all block.
+    """
+    if not q and similar_to is None:
+        raise HTTPException(status_code=400, detail="Provide either q or similar_to.")
+
+    if similar_to is not None:
+        hits = similar_interviews(similar_to, k=k)
+        if hits is None:
+            raise HTTPException(status_code=404, detail="Interview is not in the semantic index")
+    else:
+        hits = semantic_search(q, k=k)
+
+    logs = {
+        log.id: log
+        for log in db.query(InterviewLog).filter(InterviewLog.id.in_([h["log_id"] for h in hits]))
+    }
+    results = []
+    for hit in hits:
+        log = logs.get(hit["log_id"])
+        if log is None:
+            continue  # deleted from the DB but not yet from the index
+        results.append({
+            "id": log.id,
+            "candidate_name": log.candidate_name,
+            "desired_role": log.desired_role,
+            "skills": log.get_skills(),
+            "score": hit["score"],
+            "match": hit["match"],
+        })
+    return {"query": q, "similar_to": similar_to, "results": results}
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints exist only when ADMIN_TOKEN is set, and require it as X-Admin-Token"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token or "", admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def admin_profile(
+    seconds: float = Query(10, gt=0, le=120),
+    interval_ms: float = Query(5, ge=1, le=1000),
+):
+    """
+    Sample every thread for the given time and return folded stacks, ready for
+    flamegraph.pl or speedscope. Sampling runs in a worker thread so the event
+    loop keeps serving (and shows up in the profile).
+    """
+    try:
+        counts = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(to_folded(counts))
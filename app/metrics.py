@@ -0,0 +1,102 @@
+"""
+Structured timing spans, Prometheus metrics and request-id aware logging.
+
+Pipeline code wraps each stage in ``stage_span("whisper")`` etc. A span keeps
+an in-progress gauge up to date, records the latency histogram and a
+success/error counter, and emits one log line with the duration. Log lines
+carry the request id of the HTTP request that triggered them, so a slow
+request can be followed across modules.
+"""
+import contextvars
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+logger = logging.getLogger("app.metrics")
+
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+# Buckets span a fast DB commit (ms) up to a long Whisper run (minutes)
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "interview_stage_seconds", "Latency of pipeline stages", ["stage"], buckets=_LATENCY_BUCKETS
+)
+STAGE_TOTAL = Counter("interview_stage_total", "Pipeline stage executions", ["stage", "status"])
+STAGE_IN_PROGRESS = Gauge("interview_stage_in_progress", "Pipeline stages currently running", ["stage"])
+
+WHISPER_AUDIO_SECONDS = Counter("whisper_audio_seconds_total", "Seconds of audio transcribed")
+WHISPER_RTF = Histogram(
+    "whisper_real_time_factor",
+    "Transcription wall time divided by audio duration",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4),
+)
+
+HTTP_SECONDS = Histogram(
+    "http_request_seconds", "HTTP request latency", ["method", "route", "status"], buckets=_LATENCY_BUCKETS
+)
+HTTP_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests being served")
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+def configure_logging(level=logging.INFO) -> None:
+    """Install a single request-id aware handler on the root logger"""
+    root = logging.getLogger()
+    if any(isinstance(f, RequestIdFilter) for h in root.handlers for f in h.filters):
+        return
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s [req=%(request_id)s] %(message)s")
+    )
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def stage_span(stage: str, **fields):
+    """
+    Time a pipeline stage. Extra keyword fields are added to the log line;
+    the span yields a dict the caller can add more fields to.
+    """
+    STAGE_IN_PROGRESS.labels(stage).inc()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_IN_PROGRESS.labels(stage).dec()
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        STAGE_TOTAL.labels(stage, status).inc()
+        extra = " ".join(f"{key}={value}" for key, value in fields.items())
+        logger.info("stage=%s status=%s duration_ms=%.1f %s", stage, status, elapsed * 1000, extra)
+
+
+def observe_whisper(audio_seconds: float, elapsed: float) -> float:
+    """Record transcription throughput; returns the real-time factor"""
+    WHISPER_AUDIO_SECONDS.inc(audio_seconds)
+    rtf = elapsed / audio_seconds if audio_seconds > 0 else 0.0
+    if audio_seconds > 0:
+        WHISPER_RTF.observe(rtf)
+    return rtf
+
+
+def render_metrics():
+    """Body and content type for the /metrics endpoint"""
+    return generate_latest(), CONTENT_TYPE_LATEST
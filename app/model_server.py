@@ -0,0 +1,213 @@
+"""
+Shared inference process for multi-worker deployments.
+
+Every API worker would otherwise load its own copy of Whisper and the
+sentence-transformer, so N uvicorn workers cost N times the model memory.
+Instead one model server owns the models and the workers send it requests
+over a local socket (multiprocessing.connection, authenticated with a shared
+key). The connection unpickles whatever it receives, so the key is what stands
+between the socket and arbitrary code execution: both sides refuse to start
+without MODEL_SERVER_AUTHKEY, and the unix socket is created owner-only (0600).
+The server is also the only process that opens the persistent semantic index,
+which Chroma does not support sharing between processes (see app/semantic.py).
+
+    MODEL_SERVER_ADDRESS=/tmp/ai-interview-models.sock \\
+    MODEL_SERVER_AUTHKEY=$(openssl rand -hex 32) python -m app.model_server
+
+    MODEL_SERVER_ADDRESS=/tmp/ai-interview-models.sock \\
+    MODEL_SERVER_AUTHKEY=<same key> uvicorn app.main:app --workers 4
+
+The address is a unix socket path, or host:port for TCP. When
+MODEL_SERVER_ADDRESS is unset everything runs in-process as before.
+"""
+import argparse
+import logging
+import os
+import threading
+from multiprocessing.connection import Client, Listener
+
+from prometheus_client import start_http_server
+
+from .metrics import configure_logging, stage_span
+
+logger = logging.getLogger(__name__)
+
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS", "")
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY", "").encode()
+
+# Set inside the server process so its own calls never loop back to itself
+_serving = False
+_local = threading.local()
+
+
+class ModelServerError(Exception):
+    pass
+
+
+def enabled() -> bool:
+    return bool(MODEL_SERVER_ADDRESS) and not _serving
+
+
+def require_authkey() -> bytes:
+    """The shared key; there is deliberately no default, since a known key lets anyone run code via pickle"""
+    if not MODEL_SERVER_AUTHKEY:
+        raise ModelServerError("MODEL_SERVER_AUTHKEY must be set to a secret shared by the model server and its clients")
+    return MODEL_SERVER_AUTHKEY
+
+
+def parse_address(address: str):
+    """host:port becomes a TCP address, anything else a unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def _connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = Client(parse_address(MODEL_SERVER_ADDRESS), authkey=require_authkey())
+        _local.conn = conn
+    return conn
+
+
+def _drop_connection():
+    conn = getattr(_local, "conn", None)
+    _local.conn = None
+    if conn is not None:
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+
+def call(op: str, *args):
+    """Run `op` on the model server; one connection per calling thread, reconnecting once"""
+    with stage_span("model_rpc", op=op):
+        for attempt in (1, 2):
+            try:
+                conn = _connection()
+                conn.send((op, args))
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                _drop_connection()
+                if attempt == 2:
+                    raise ModelServerError(f"Model server unreachable at {MODEL_SERVER_ADDRESS}: {e}")
+    if status != "ok":
+        raise ModelServerError(result)
+    return result
+
+
+def _transcribe(audio):
+    from .audio_utils import transcribe_audio_locally
+
+    result = transcribe_audio_locally(audio)
+    segments = result["segments"]
+    # SegmentArray crosses the socket in its packed form
+    result["segments"] = segments.pack() if segments is not None else None
+    return result
+
+
+def _embed(texts, batch_size=32):
+    from .nlp import get_sentence_model
+
+    if not texts:
+        return []
+    return get_sentence_model().encode(list(texts), batch_size=batch_size, normalize_embeddings=True).tolist()
+
+
+def _semantic(name):
+    """Semantic index operations run here so only one process opens the Chroma directory"""
+    def run(*args):
+        from . import semantic
+
+        return getattr(semantic, name)(*args)
+    return run
+
+
+OPERATIONS = {
+    "ping": lambda: "pong",
+    "transcribe": _transcribe,
+    "embed": _embed,
+    "semantic_upsert": _semantic("upsert_documents"),
+    "semantic_remove": _semantic("remove_interviews"),
+    "semantic_reset": _semantic("reset_index"),
+    "semantic_search": _semantic("semantic_search"),
+    "semantic_similar": _semantic("similar_interviews"),
+}
+
+
+def _serve_connection(conn):
+    with conn:
+        while True:
+            try:
+                op, args = conn.recv()
+            except (EOFError, OSError):
+                return
+            if op not in OPERATIONS:
+                conn.send(("error", f"Unknown operation: {op}"))
+                continue
+            try:
+                conn.send(("ok", OPERATIONS[op](*args)))
+            except Exception as e:
+                logger.exception("Model server %s failed", op)
+                conn.send(("error", f"{op} failed: {e}"))
+
+
+def serve(address: str):
+    global _serving
+    authkey = require_authkey()
+    _serving = True
+    # Under `python -m app.model_server` this module is __main__, while app.nlp
+    # and app.audio_utils import a second copy as app.model_server; that copy
+    # must know it is serving too, or their calls would loop back over the socket
+    from . import model_server as imported
+
+    imported._serving = True
+
+    from .audio_utils import get_whisper_model
+    from .nlp import get_sentence_model
+
+    # Load everything up front so the first request doesn't pay for it
+    get_whisper_model()
+    get_sentence_model()
+
+    address = parse_address(address)
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)  # stale socket from a previous run
+    # Owner-only socket file: the umask applies at bind time, so there is no window
+    # in which other local users could connect
+    previous_umask = os.umask(0o177)
+    try:
+        listener = Listener(address, authkey=authkey)
+    finally:
+        os.umask(previous_umask)
+    with listener:
+        logger.info("Model server listening on %s", address)
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:  # failed handshake, e.g. a wrong authkey
+                logger.warning("Rejected model server connection: %s", e)
+                continue
+            threading.Thread(target=_serve_connection, args=(conn,), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Whisper and embeddings to API workers")
+    parser.add_argument("--address", default=MODEL_SERVER_ADDRESS or "/tmp/ai-interview-models.sock")
+    parser.add_argument("--metrics-port", type=int, default=0, help="expose Whisper stage metrics for Prometheus")
+    args = parser.parse_args()
+    configure_logging()
+    try:
+        require_authkey()
+    except ModelServerError as e:
+        parser.error(str(e))
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    serve(args.address)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, Float, String, DateTime, Text, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 import json
+from .segments import SegmentArray
 
 Base = declarative_base()
 
@@ -12,10 +13,25 @@ class InterviewLog(Base):
     transcription = Column(Text, nullable=False)
     candidate_name = Column(String)
     skills = Column(Text)  # Store as JSON string
-    years_experience = Column(Integer)
+    # Fractional, like the extraction schema (2.5 years); existing INTEGER
+    # columns need no migration, SQLite keeps non-integral values as REAL
+    years_experience = Column(Float)
     desired_role = Column(String)
     selected_faq = Column(Text)  # Store as JSON string
     timestamp = Column(DateTime, default=datetime.utcnow)
+    audio_hash = Column(String, index=True)  # sha256 of the uploaded audio bytes
+    segments = Column(LargeBinary)  # packed SegmentArray, see app/segments.py
+    # Which prompt/model produced the extracted fields; NULL means the
+    # extraction failed or predates versioning, so app.reextract will redo it
+    prompt_version = Column(String)
+    llm_model = Column(String)
+    extracted_at = Column(DateTime)
+
+    # Backs keyset pagination on (timestamp, id) for the /interviews listing
+    __table_args__ = (
+        Index("ix_interview_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_interview_logs_extraction", "prompt_version", "llm_model"),
+    )
 
     def set_skills(self, skills_list):
         self.skills = json.dumps(skills_list)
@@ -27,4 +43,21 @@ class InterviewLog(Base):
         self.selected_faq = json.dumps(faq_dict)
 
     def get_selected_faq(self):
-        return json.loads(self.selected_faq or "{}") 
\ No newline at end of file
+        return json.loads(self.selected_faq or "{}")
+
+    def set_segments(self, segment_array):
+        self.segments = segment_array.pack() if segment_array is not None else None
+
+    def get_segments(self):
+        return SegmentArray.unpack(self.segments) if self.segments else None
+
+    def set_extraction(self, analysis, prompt_version=None, llm_model=None):
+        """Store extracted fields; pass the versions only when the extraction succeeded"""
+        self.candidate_name = analysis.get("candidate_name")
+        self.years_experience = analysis.get("years_experience")
+        self.desired_role = analysis.get("desired_role")
+        self.set_skills(analysis.get("skills", []))
+        self.set_selected_faq(analysis.get("faq", []))
+        self.prompt_version = prompt_version
+        self.llm_model = llm_model
+        self.extracted_at = datetime.utcnow() if prompt_version else None
@@ -0,0 +1,159 @@
+"""
+Opt-in production profiling: an in-process sampling profiler and an
+event-loop lag monitor.
+
+The sampler walks ``sys._current_frames()`` at a fixed interval and counts
+identical stacks, producing the "folded" format understood by flamegraph.pl,
+speedscope and inferno. It can be triggered over HTTP (see /admin/profile in
+app.main) or by sending SIGUSR2 to the process, which writes a file under
+PROFILE_DIR.
+
+The lag monitor runs a heartbeat coroutine on the event loop and a watchdog
+thread beside it. When the heartbeat stalls for longer than the threshold the
+watchdog logs the loop thread's current stack, i.e. the synchronous call that
+is blocking every other request.
+"""
+import asyncio
+import collections
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Optional
+
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+MAX_PROFILE_SECONDS = 120
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a heartbeat's scheduled and actual wake-up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+def _folded_stack(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> collections.Counter:
+    """Sample every thread's stack for `seconds`; only one profile may run at a time"""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    try:
+        seconds = min(seconds, MAX_PROFILE_SECONDS)
+        me = threading.get_ident()
+        counts = collections.Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                counts[_folded_stack(frame, names.get(thread_id, f"thread-{thread_id}"))] += 1
+            time.sleep(interval)
+        return counts
+    finally:
+        _profile_lock.release()
+
+
+def to_folded(counts: collections.Counter) -> str:
+    """One "frame;frame;frame count" line per distinct stack, hottest first"""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+def _profile_to_file(seconds: float) -> None:
+    try:
+        folded = to_folded(sample_stacks(seconds))
+    except ProfilerBusy:
+        logger.warning("Profile signal ignored: a profile is already running")
+        return
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"profile-{datetime.utcnow():%Y%m%d%H%M%S}-{os.getpid()}.folded")
+    with open(path, "w") as f:
+        f.write(folded)
+    logger.info("Wrote %.0fs sampling profile to %s", seconds, path)
+
+
+def install_profile_signal(seconds: float = 30.0) -> bool:
+    """Profile for `seconds` in a background thread whenever SIGUSR2 arrives"""
+    if not hasattr(signal, "SIGUSR2"):
+        return False
+
+    def handler(signum, frame):
+        threading.Thread(target=_profile_to_file, args=(seconds,), name="profiler", daemon=True).start()
+
+    try:
+        signal.signal(signal.SIGUSR2, handler)
+    except ValueError:  # not on the main thread
+        return False
+    return True
+
+
+class LoopLagMonitor:
+    def __init__(self, threshold: float, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self.last_tick = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _heartbeat(self):
+        while not self._stopped.is_set():
+            scheduled = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            LOOP_LAG.observe(max(0.0, now - scheduled))
+            self.last_tick = now
+
+    def _watchdog(self):
+        reported_tick = None
+        while not self._stopped.wait(min(self.interval, self.threshold) / 2):
+            # The heartbeat is due back one interval after its last tick; only
+            # the time past that is the loop being blocked
+            stalled = time.monotonic() - (self.last_tick + self.interval)
+            if stalled < self.threshold or reported_tick == self.last_tick:
+                continue
+            reported_tick = self.last_tick  # one report per stall
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            logger.warning(
+                "Event loop blocked for %.0f ms (threshold %.0f ms); loop thread stack:\n%s",
+                stalled * 1000, self.threshold * 1000, stack,
+            )
+
+    def start(self):
+        """Call from inside the running event loop (e.g. a startup hook)"""
+        self.loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        # Keep a strong reference; the loop only holds weak ones to its tasks
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        threading.Thread(target=self._watchdog, name="loop-lag-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
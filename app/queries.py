@@ -0,0 +1,151 @@
+import base64
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, load_only
+
+from .models import InterviewLog
+
+# Columns a client may ask for via ?fields=. The transcription and segments are
+# large, so they are only returned when explicitly requested.
+INTERVIEW_FIELDS = [
+    "id",
+    "filename",
+    "transcription",
+    "candidate_name",
+    "skills",
+    "years_experience",
+    "desired_role",
+    "selected_faq",
+    "timestamp",
+    "segments",
+]
+DEFAULT_FIELDS = [f for f in INTERVIEW_FIELDS if f not in ("transcription", "segments")]
+
+MAX_PAGE_SIZE = 200
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Turn a comma separated ?fields= value into a validated column list"""
+    if not fields:
+        return list(DEFAULT_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in INTERVIEW_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def encode_cursor(timestamp: datetime, log_id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, log_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def serialize_log(log: InterviewLog, fields: List[str]) -> dict:
+    """Convert a (possibly partially loaded) log row into a JSON friendly dict"""
+    item = {}
+    for field in fields:
+        if field == "skills":
+            item[field] = log.get_skills()
+        elif field == "selected_faq":
+            item[field] = log.get_selected_faq()
+        elif field == "segments":
+            segments = log.get_segments()
+            item[field] = segments.to_list() if segments is not None else None
+        elif field == "timestamp":
+            item[field] = log.timestamp.isoformat() if log.timestamp else None
+        else:
+            item[field] = getattr(log, field)
+    return item
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filter_interviews(
+    query,
+    skill: Optional[str] = None,
+    role: Optional[str] = None,
+    min_years: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """Apply the common /interviews filters to an InterviewLog query"""
+    if skill:
+        # skills is a JSON encoded list, so match the quoted element
+        query = query.filter(
+            InterviewLog.skills.like(f'%"{_escape_like(skill)}"%', escape="\\")
+        )
+    if role:
+        query = query.filter(
+            InterviewLog.desired_role.like(f"%{_escape_like(role)}%", escape="\\")
+        )
+    if min_years is not None:
+        query = query.filter(InterviewLog.years_experience >= min_years)
+    if date_from is not None:
+        query = query.filter(InterviewLog.timestamp >= date_from)
+    if date_to is not None:
+        query = query.filter(InterviewLog.timestamp < date_to)
+    return query
+
+
+def list_interviews(
+    db: Session,
+    fields: List[str],
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    **filters,
+) -> dict:
+    """
+    Return one page of interview logs, newest first.
+
+    Pages are addressed by a keyset cursor on (timestamp, id) rather than an
+    OFFSET, so every page is an index range scan no matter how deep it is.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # timestamp and id are always loaded because the next cursor needs them
+    columns = {"id", "timestamp", *fields}
+    query = db.query(InterviewLog).options(
+        load_only(*[getattr(InterviewLog, c) for c in columns])
+    )
+    query = filter_interviews(query, **filters)
+
+    if cursor:
+        cursor_ts, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(InterviewLog.timestamp, InterviewLog.id) < tuple_(cursor_ts, cursor_id)
+        )
+
+    rows = (
+        query.order_by(InterviewLog.timestamp.desc(), InterviewLog.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    return {
+        "items": [serialize_log(row, fields) for row in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def get_interview(db: Session, log_id: int, fields: List[str]) -> Optional[dict]:
+    log = db.query(InterviewLog).filter(InterviewLog.id == log_id).first()
+    if log is None:
+        return None
+    return serialize_log(log, fields)
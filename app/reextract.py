@@ -0,0 +1,235 @@
+"""
+Re-run LLM extraction over stored transcripts.
+
+    python -m app.reextract                 # rows extracted by an older prompt/model
+    python -m app.reextract --dry-run       # just count them
+    python -m app.reextract --force --rate 1
+
+Every row records the PROMPT_VERSION and LLM model that produced its
+candidate_name, skills, role and FAQs. Rows from an older prompt, from a
+model no longer among the LLM router's routes, or from the rule-based
+fallback are stale. This job walks the table in id order, sends the stored
+transcription (only the candidate's turns when speaker labels were stored)
+to the LLM with a bounded number of concurrent calls under a
+requests-per-second limit, and writes the new fields and versions back.
+There is no latency budget here, so the router always picks a real model.
+Whisper is never involved, so a refresh costs only the LLM calls. Rows whose
+extraction fails keep their old fields and stay stale, so running the job
+again retries just those.
+"""
+import argparse
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import load_only
+
+from .metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+FAILED_TRANSCRIPTION_PREFIX = "Audio transcription failed"
+
+
+class RateLimiter:
+    """Token bucket shared by the worker threads: `rate` calls per second, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ReextractReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stale = 0
+        self.scanned = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = []
+        self.llm_seconds = 0.0
+
+    def print(self):
+        wall = time.perf_counter() - self.started
+        print("\n[REEXTRACT] ===== Re-extraction report =====")
+        print(f"[REEXTRACT] Stale rows       : {self.stale}")
+        print(f"[REEXTRACT] Scanned          : {self.scanned}")
+        print(f"[REEXTRACT] Updated          : {self.updated}")
+        print(f"[REEXTRACT] Skipped          : {self.skipped} (no usable transcription)")
+        print(f"[REEXTRACT] Failed           : {len(self.failed)}")
+        print(f"[REEXTRACT] Wall time        : {wall:.1f}s")
+        if wall > 0 and self.updated:
+            print(f"[REEXTRACT] Throughput       : {self.updated / wall * 60:.1f} rows/min, "
+                  f"mean LLM call {self.llm_seconds / (self.updated + len(self.failed)):.2f}s")
+        for log_id, error in self.failed:
+            print(f"[REEXTRACT] FAILED id={log_id}: {error}")
+
+
+def stale_rows(query, prompt_version: str, llm_models: list):
+    """Rows not yet extracted with this prompt version by one of these models"""
+    from .models import InterviewLog
+
+    return query.filter(or_(
+        InterviewLog.prompt_version.is_(None),
+        InterviewLog.llm_model.is_(None),
+        InterviewLog.prompt_version != prompt_version,
+        InterviewLog.llm_model.notin_(llm_models),
+    ))
+
+
+def extraction_input(log) -> Optional[str]:
+    """What the live pipeline would have sent to the LLM for this row, or None to skip it"""
+    from .diarization import candidate_text
+
+    transcription = log.transcription or ""
+    if not transcription.strip() or transcription.startswith(FAILED_TRANSCRIPTION_PREFIX):
+        return None
+    try:
+        segments = log.get_segments()
+    except ValueError:
+        segments = None
+    return candidate_text(segments, fallback=transcription)
+
+
+def _extract(limiter: RateLimiter, text: str):
+    from .nlp import extract_entities
+
+    limiter.acquire()
+    start = time.perf_counter()
+    analysis = extract_entities(text, latency_budget=math.inf)
+    return analysis, time.perf_counter() - start
+
+
+def run_reextract(
+    batch_size: int = 50,
+    workers: int = 4,
+    rate: float = 2.0,
+    limit: Optional[int] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    index: bool = True,
+) -> ReextractReport:
+    from .db import SessionLocal
+    from .models import InterviewLog
+    from .llm_router import LOCAL_MODEL, router
+    from .nlp import PROMPT_VERSION, extraction_version
+
+    report = ReextractReport()
+    db = SessionLocal()
+    try:
+        base = db.query(InterviewLog)
+        if not force:
+            base = stale_rows(base, PROMPT_VERSION, router.models())
+        report.stale = base.count()
+        logger.info(
+            "%d rows to re-extract with prompt %s / %s", report.stale, PROMPT_VERSION, router.models()
+        )
+        if dry_run or not report.stale:
+            return report
+
+        limiter = RateLimiter(rate, burst=workers)
+        last_id = 0
+        with ThreadPoolExecutor(workers) as pool:
+            while limit is None or report.scanned < limit:
+                # Keyset batches by id: rows that fail stay stale but are not revisited this run
+                size = batch_size if limit is None else min(batch_size, limit - report.scanned)
+                rows = (
+                    base.options(load_only(InterviewLog.id, InterviewLog.transcription, InterviewLog.segments))
+                    .filter(InterviewLog.id > last_id)
+                    .order_by(InterviewLog.id)
+                    .limit(size)
+                    .all()
+                )
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                report.scanned += len(rows)
+
+                futures = {}
+                for log in rows:
+                    text = extraction_input(log)
+                    if text is None:
+                        report.skipped += 1
+                        continue
+                    futures[pool.submit(_extract, limiter, text)] = log
+
+                updated = []
+                for future in as_completed(futures):
+                    log = futures[future]
+                    try:
+                        analysis, seconds = future.result()
+                    except Exception as e:
+                        report.failed.append((log.id, str(e)))
+                        continue
+                    report.llm_seconds += seconds
+                    version = extraction_version(analysis)
+                    if version["prompt_version"] is None or version["llm_model"] == LOCAL_MODEL:
+                        # Keep the previous fields rather than overwrite them with
+                        # blanks or a rule-based stand-in
+                        report.failed.append((log.id, "LLM extraction failed"))
+                        continue
+                    log.set_extraction(analysis, **version)
+                    updated.append(log)
+
+                db.commit()
+                report.updated += len(updated)
+                if index and updated:
+                    try:
+                        from .semantic import index_interviews
+
+                        index_interviews(updated)
+                    except Exception as e:
+                        logger.warning("Semantic indexing failed (non-critical): %s", e)
+                logger.info("Re-extracted %d/%d", report.updated, report.stale)
+    finally:
+        db.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run LLM extraction on stored transcripts")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls")
+    parser.add_argument("--rate", type=float, default=2.0, help="Max LLM calls per second (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many rows")
+    parser.add_argument("--force", action="store_true", help="Re-extract every row, not only stale ones")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be processed")
+    parser.add_argument("--no-index", action="store_true", help="Skip semantic re-indexing")
+    args = parser.parse_args()
+    configure_logging()
+
+    report = run_reextract(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        rate=args.rate,
+        limit=args.limit,
+        force=args.force,
+        dry_run=args.dry_run,
+        index=not args.no_index,
+    )
+    report.print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Retention and purge tooling for interview logs, uploaded audio and TTS files.
+
+    python -m app.retention --db-max-age-days 180 --uploads-max-mb 2048 --dry-run
+    python -m app.retention --purge-all            # what clear_logs.py used to do
+
+Every policy is off unless configured, either on the command line or through
+the RETENTION_* environment variables (which the FastAPI app also reads to run
+the same sweep periodically in the background). Rows are deleted in small
+id-bounded chunks, each in its own short transaction, so the API keeps writing
+while a purge runs; freed pages are then returned with an incremental vacuum.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+
+from .metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = "uploads"
+AUDIO_RESP_DIR = "tts_responses"
+
+DELETE_CHUNK_SIZE = 500
+CHUNK_PAUSE_SECONDS = 0.05
+VACUUM_PAGES_PER_STEP = 2000
+
+
+def _env_number(name: str, cast=float):
+    value = os.getenv(name)
+    return cast(value) if value not in (None, "") else None
+
+
+class RetentionPolicy:
+    """Which limits to enforce; None disables a limit"""
+
+    def __init__(
+        self,
+        db_max_age_days: Optional[float] = None,
+        db_max_rows: Optional[int] = None,
+        uploads_max_age_days: Optional[float] = None,
+        uploads_max_mb: Optional[float] = None,
+        tts_max_age_days: Optional[float] = None,
+        tts_max_mb: Optional[float] = None,
+    ):
+        self.db_max_age_days = db_max_age_days
+        self.db_max_rows = db_max_rows
+        self.uploads_max_age_days = uploads_max_age_days
+        self.uploads_max_mb = uploads_max_mb
+        self.tts_max_age_days = tts_max_age_days
+        self.tts_max_mb = tts_max_mb
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            db_max_age_days=_env_number("RETENTION_DB_MAX_AGE_DAYS"),
+            db_max_rows=_env_number("RETENTION_DB_MAX_ROWS", int),
+            uploads_max_age_days=_env_number("RETENTION_UPLOADS_MAX_AGE_DAYS"),
+            uploads_max_mb=_env_number("RETENTION_UPLOADS_MAX_MB"),
+            tts_max_age_days=_env_number("RETENTION_TTS_MAX_AGE_DAYS"),
+            tts_max_mb=_env_number("RETENTION_TTS_MAX_MB"),
+        )
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in vars(self).values())
+
+
+def _delete_ids_in_chunks(engine, select_sql: str, params: dict, dry_run: bool, chunk_size: int) -> list:
+    """Repeatedly select up to chunk_size matching ids and delete them in a short transaction"""
+    deleted = []
+    if dry_run:
+        with engine.connect() as conn:
+            rows = conn.execute(text(select_sql.replace("LIMIT :chunk", "")), params)
+            return [row[0] for row in rows]
+
+    while True:
+        with engine.begin() as conn:
+            ids = [row[0] for row in conn.execute(text(select_sql), {**params, "chunk": chunk_size})]
+            if not ids:
+                break
+            placeholders = ", ".join(f":id{i}" for i in range(len(ids)))
+            conn.execute(
+                text(f"DELETE FROM interview_logs WHERE id IN ({placeholders})"),
+                {f"id{i}": log_id for i, log_id in enumerate(ids)},
+            )
+        deleted.extend(ids)
+        # let queued writers in between chunks
+        time.sleep(CHUNK_PAUSE_SECONDS)
+    return deleted
+
+
+def purge_db_rows(
+    engine,
+    max_age_days: Optional[float] = None,
+    max_rows: Optional[int] = None,
+    purge_all: bool = False,
+    dry_run: bool = False,
+    chunk_size: int = DELETE_CHUNK_SIZE,
+) -> list:
+    """Delete interview logs that violate the age/row-count policy; returns the ids removed"""
+    deleted = []
+    if purge_all:
+        deleted += _delete_ids_in_chunks(
+            engine, "SELECT id FROM interview_logs ORDER BY id LIMIT :chunk", {}, dry_run, chunk_size
+        )
+        return deleted
+
+    if max_age_days is not None:
+        # formatted the way SQLAlchemy stores DateTime in SQLite, so the
+        # string comparison in SQL lines up
+        cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S.%f")
+        deleted += _delete_ids_in_chunks(
+            engine,
+            "SELECT id FROM interview_logs WHERE timestamp < :cutoff ORDER BY id LIMIT :chunk",
+            {"cutoff": cutoff},
+            dry_run,
+            chunk_size,
+        )
+
+    if max_rows is not None:
+        # Find the newest row that falls outside the keep window, then delete
+        # it and everything older using the (timestamp, id) index
+        with engine.connect() as conn:
+            boundary = conn.execute(
+                text(
+                    "SELECT timestamp, id FROM interview_logs "
+                    "ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET :keep"
+                ),
+                {"keep": max_rows},
+            ).first()
+        if boundary is not None:
+            already = set(deleted)
+            deleted += [
+                log_id
+                for log_id in _delete_ids_in_chunks(
+                    engine,
+                    "SELECT id FROM interview_logs WHERE (timestamp, id) <= (:ts, :id) "
+                    "ORDER BY id LIMIT :chunk",
+                    {"ts": boundary[0], "id": boundary[1]},
+                    dry_run,
+                    chunk_size,
+                )
+                if log_id not in already
+            ]
+    return deleted
+
+
+def purge_directory(
+    directory: str,
+    max_age_days: Optional[float] = None,
+    max_mb: Optional[float] = None,
+    dry_run: bool = False,
+) -> dict:
+    """Remove files older than max_age_days, then the oldest files until under max_mb"""
+    result = {"directory": directory, "files": 0, "bytes": 0}
+    if not os.path.isdir(directory) or (max_age_days is None and max_mb is None):
+        return result
+
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    entries.sort()  # oldest first
+
+    to_delete = []
+    if max_age_days is not None:
+        cutoff = time.time() - max_age_days * 86400
+        to_delete = [e for e in entries if e[0] < cutoff]
+        entries = entries[len(to_delete):]
+    if max_mb is not None:
+        total = sum(size for _, size, _ in entries)
+        limit = max_mb * 1024 * 1024
+        for entry in entries:
+            if total <= limit:
+                break
+            to_delete.append(entry)
+            total -= entry[1]
+
+    for _, size, path in to_delete:
+        if not dry_run:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning("Could not remove %s: %s", path, e)
+                continue
+        result["files"] += 1
+        result["bytes"] += size
+    return result
+
+
+def incremental_vacuum(engine, pages: int = VACUUM_PAGES_PER_STEP) -> int:
+    """Hand free pages back to the filesystem a few thousand at a time"""
+    reclaimed = 0
+    with engine.connect() as conn:
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode != 2:
+            logger.warning("auto_vacuum is not INCREMENTAL; run app.retention with "
+                           "--enable-incremental-vacuum once to convert the database")
+            return 0
+        while True:
+            free = conn.execute(text("PRAGMA freelist_count")).scalar()
+            if not free:
+                break
+            step = min(free, pages)
+            conn.exec_driver_sql(f"PRAGMA incremental_vacuum({step})")
+            conn.commit()
+            reclaimed += step
+            time.sleep(CHUNK_PAUSE_SECONDS)
+    return reclaimed
+
+
+def enable_incremental_vacuum(engine) -> None:
+    """One-off conversion of an existing database (rewrites the file once)"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+
+
+def _forget_semantic(log_ids: list) -> None:
+    """Drop deleted interviews from the semantic index, if one has been built"""
+    from . import model_server, semantic
+
+    # With a model server the index lives there, not in this process's directory
+    if not log_ids or (not model_server.enabled() and not os.path.isdir(semantic.SEMANTIC_INDEX_DIR)):
+        return
+    try:
+        semantic.remove_interviews(log_ids)
+    except Exception as e:
+        logger.warning("Semantic index cleanup failed (non-critical): %s", e)
+
+
+def run_retention(policy: RetentionPolicy, dry_run: bool = False, purge_all: bool = False) -> dict:
+    """Apply a policy once and return a summary of what was (or would be) removed"""
+    from .db import engine
+
+    started = time.perf_counter()
+    deleted_ids = purge_db_rows(
+        engine,
+        max_age_days=policy.db_max_age_days,
+        max_rows=policy.db_max_rows,
+        purge_all=purge_all,
+        dry_run=dry_run,
+    )
+    summary = {
+        "dry_run": dry_run,
+        "db_rows": len(deleted_ids),
+        "uploads": purge_directory(UPLOAD_DIR, policy.uploads_max_age_days, policy.uploads_max_mb, dry_run),
+        "tts": purge_directory(AUDIO_RESP_DIR, policy.tts_max_age_days, policy.tts_max_mb, dry_run),
+        "vacuumed_pages": 0,
+    }
+    if not dry_run and deleted_ids:
+        _forget_semantic(deleted_ids)
+        summary["vacuumed_pages"] = incremental_vacuum(engine)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+async def retention_loop(interval_hours: float, policy: Optional[RetentionPolicy] = None):
+    """Background task for the FastAPI app: sweep now, then every interval_hours"""
+    policy = policy or RetentionPolicy.from_env()
+    while True:
+        try:
+            summary = await asyncio.to_thread(run_retention, policy)
+            logger.info("Retention sweep complete: %s", summary)
+        except Exception as e:
+            logger.error("Retention sweep failed: %s", e)
+        await asyncio.sleep(interval_hours * 3600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforce retention limits on logs and audio files")
+    env = RetentionPolicy.from_env()
+    parser.add_argument("--db-max-age-days", type=float, default=env.db_max_age_days)
+    parser.add_argument("--db-max-rows", type=int, default=env.db_max_rows)
+    parser.add_argument("--uploads-max-age-days", type=float, default=env.uploads_max_age_days)
+    parser.add_argument("--uploads-max-mb", type=float, default=env.uploads_max_mb)
+    parser.add_argument("--tts-max-age-days", type=float, default=env.tts_max_age_days)
+    parser.add_argument("--tts-max-mb", type=float, default=env.tts_max_mb)
+    parser.add_argument("--purge-all", action="store_true", help="Delete every interview log")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Convert the database to auto_vacuum=INCREMENTAL (one full VACUUM)")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.enable_incremental_vacuum:
+        from .db import engine
+
+        enable_incremental_vacuum(engine)
+        print("[RETENTION] Database converted to incremental auto-vacuum")
+
+    policy = RetentionPolicy(
+        db_max_age_days=args.db_max_age_days,
+        db_max_rows=args.db_max_rows,
+        uploads_max_age_days=args.uploads_max_age_days,
+        uploads_max_mb=args.uploads_max_mb,
+        tts_max_age_days=args.tts_max_age_days,
+        tts_max_mb=args.tts_max_mb,
+    )
+    if policy.is_empty() and not args.purge_all:
+        if not args.enable_incremental_vacuum:
+            parser.error("no retention limits configured")
+        return
+
+    summary = run_retention(policy, dry_run=args.dry_run, purge_all=args.purge_all)
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"[RETENTION] {verb} {summary['db_rows']} interview logs")
+    for key in ("uploads", "tts"):
+        info = summary[key]
+        print(f"[RETENTION] {verb} {info['files']} files ({info['bytes'] / 1e6:.1f} MB) from {info['directory']}")
+    if summary["vacuumed_pages"]:
+        print(f"[RETENTION] Reclaimed {summary['vacuumed_pages']} database pages")
+
+
+if __name__ == "__main__":
+    main()
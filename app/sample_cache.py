@@ -0,0 +1,100 @@
+"""
+Versioned on-disk cache of the sample-audio pipeline results.
+
+The demo clips never change, so their transcription and extraction are
+computed once (in the background at startup) and then served from memory.
+Each entry records the audio hash and the pipeline version (Whisper model,
+LLM model and prompt version); when any of those change the entry is stale
+and gets recomputed on the next warm-up or ?refresh=true request.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+from . import audio_utils, nlp
+from .llm_router import router
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_CACHE_PATH = os.getenv("SAMPLE_CACHE_PATH", os.path.join("sample_cache", "sample_results.json"))
+
+
+def pipeline_version() -> str:
+    return (
+        f"whisper={audio_utils.WHISPER_MODEL_SIZE}/{audio_utils.WHISPER_COMPUTE_TYPE}/beam{audio_utils.WHISPER_BEAM_SIZE};"
+        f"vad={int(audio_utils.VAD_ENABLED)};"
+        f"diarization={int(audio_utils.DIARIZATION_ENABLED)};"
+        f"llm={'+'.join(router.models())};prompt={nlp.PROMPT_VERSION}"
+    )
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SampleCache:
+    """
+    get() may hash a clip and put() rewrites the JSON file, so async callers
+    run both in a worker thread
+    """
+
+    def __init__(self, path: str = SAMPLE_CACHE_PATH):
+        self.path = path
+        self._entries = {}
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def audio_hash(self, file_path: str) -> str:
+        # hash each clip once per process; mtime and size guard against a swapped file
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(file_path)
+        return self._hashes[key]
+
+    def get(self, sample_id: str, file_path: str) -> Optional[dict]:
+        """The cached result, or None if missing or produced by another pipeline version"""
+        entry = self._entries.get(sample_id)
+        if (
+            entry is None
+            or entry.get("version") != pipeline_version()
+            or entry.get("audio_sha256") != self.audio_hash(file_path)
+        ):
+            return None
+        return entry["result"]
+
+    def put(self, sample_id: str, file_path: str, result: dict) -> None:
+        with self._lock:
+            self._entries[sample_id] = {
+                "version": pipeline_version(),
+                "audio_sha256": self.audio_hash(file_path),
+                "created_at": datetime.utcnow().isoformat(),
+                "result": result,
+            }
+            self._save()
+
+
+sample_cache = SampleCache()
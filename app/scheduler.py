@@ -0,0 +1,211 @@
+"""
+Admission control in front of the expensive pipeline stages.
+
+Each stage ("whisper", "llm") has a fixed number of slots. Requests that find
+no free slot queue up and are granted slots in order of:
+
+1. priority class: interactive Q&A, then live uploads, then batch work
+   (sample runs, cache warm-up, bulk jobs that send ``X-Priority: batch``);
+2. within a class, weighted fair queuing across tenants (one tenant per
+   ``X-API-Key``), so one client's bulk job cannot crowd out another's.
+
+Batch work may only occupy some of the slots, keeping capacity free for
+interactive users while otherwise soaking up whatever is idle. Everything
+runs on the event loop, so no locks are needed; the scheduler is per process.
+
+Configuration (environment):
+    SCHED_WHISPER_SLOTS, SCHED_LLM_SLOTS      concurrent runs per stage
+    SCHED_WHISPER_BATCH_SLOTS, SCHED_LLM_BATCH_SLOTS
+                                              how many of those batch may use
+    SCHED_MAX_QUEUE                           waiting requests per stage before
+                                              new ones get 429 (0 = unbounded)
+    SCHED_TENANT_MAX_INFLIGHT                 running slots per tenant per stage
+    SCHED_TENANT_WEIGHTS                      "key1=4,key2=1" fair-share weights
+"""
+import asyncio
+import hashlib
+import itertools
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from prometheus_client import Gauge, Histogram
+
+INTERACTIVE = 0
+UPLOAD = 1
+BATCH = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", UPLOAD: "upload", BATCH: "batch"}
+_PRIORITY_BY_NAME = {name: priority for priority, name in PRIORITY_NAMES.items()}
+
+ANONYMOUS = "anonymous"
+
+SCHED_WAIT_SECONDS = Histogram(
+    "scheduler_wait_seconds",
+    "Time spent queued for a pipeline stage slot",
+    ["stage", "priority"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+SCHED_QUEUED = Gauge("scheduler_queued", "Requests waiting for a stage slot", ["stage", "priority"])
+SCHED_RUNNING = Gauge("scheduler_running", "Stage slots in use", ["stage", "priority"])
+
+
+class SchedulerBusy(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"Too many requests queued for {stage}")
+        self.stage = stage
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for item in spec.split(","):
+        key, sep, weight = item.strip().rpartition("=")
+        if sep and key:
+            weights[tenant_id(key)] = float(weight)
+    return weights
+
+
+def tenant_id(api_key: Optional[str]) -> str:
+    """A stable, non-reversible tenant id, so API keys never end up in memory dumps or logs"""
+    if not api_key:
+        return ANONYMOUS
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def resolve_priority(default: int, requested: Optional[str]) -> int:
+    """Clients may ask for a lower priority (X-Priority: batch) but never a higher one"""
+    return max(default, _PRIORITY_BY_NAME.get((requested or "").strip().lower(), default))
+
+
+class _Waiter:
+    __slots__ = ("priority", "tenant", "tag", "seq", "future")
+
+    def __init__(self, priority, tenant, tag, seq, future):
+        self.priority = priority
+        self.tenant = tenant
+        self.tag = tag
+        self.seq = seq
+        self.future = future
+
+
+class StageScheduler:
+    def __init__(
+        self,
+        stage: str,
+        slots: int,
+        batch_slots: Optional[int] = None,
+        max_queue: int = 0,
+        tenant_max_inflight: int = 0,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self.stage = stage
+        self.slots = max(1, slots)
+        self.class_limits = {BATCH: max(1, batch_slots if batch_slots is not None else self.slots - 1)}
+        self.max_queue = max_queue
+        self.tenant_max_inflight = tenant_max_inflight
+        self.weights = weights or {}
+        self._waiting = []
+        self._running = 0
+        self._running_by_class = Counter()
+        self._running_by_tenant = Counter()
+        # Weighted fair queuing state, kept per priority class: a virtual
+        # clock and each tenant's last virtual finish tag
+        self._vtime = Counter()
+        self._finish: Dict[tuple, float] = {}
+        self._seq = itertools.count()
+
+    def _eligible(self, priority: int, tenant: str) -> bool:
+        if self._running >= self.slots:
+            return False
+        limit = self.class_limits.get(priority)
+        if limit is not None and self._running_by_class[priority] >= limit:
+            return False
+        if self.tenant_max_inflight and self._running_by_tenant[tenant] >= self.tenant_max_inflight:
+            return False
+        return True
+
+    def _grant(self, priority: int, tenant: str) -> None:
+        self._running += 1
+        self._running_by_class[priority] += 1
+        self._running_by_tenant[tenant] += 1
+        SCHED_RUNNING.labels(self.stage, PRIORITY_NAMES[priority]).inc()
+
+    def _release(self, priority: int, tenant: str) -> None:
+        self._running -= 1
+        self._running_by_class[priority] -= 1
+        self._running_by_tenant[tenant] -= 1
+        if not self._running_by_tenant[tenant]:
+            del self._running_by_tenant[tenant]
+        SCHED_RUNNING.labels(self.stage, PRIORITY_NAMES[priority]).dec()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the best eligible waiters: class first, then fair-share tag"""
+        while self._waiting:
+            candidates = [w for w in self._waiting if self._eligible(w.priority, w.tenant)]
+            if not candidates:
+                return
+            waiter = min(candidates, key=lambda w: (w.priority, w.tag, w.seq))
+            self._waiting.remove(waiter)
+            SCHED_QUEUED.labels(self.stage, PRIORITY_NAMES[waiter.priority]).dec()
+            self._vtime[waiter.priority] = max(self._vtime[waiter.priority], waiter.tag)
+            self._grant(waiter.priority, waiter.tenant)
+            waiter.future.set_result(None)
+
+    def _tag(self, priority: int, tenant: str, cost: float) -> float:
+        key = (priority, tenant)
+        tag = max(self._vtime[priority], self._finish.get(key, 0.0)) + cost / self.weights.get(tenant, 1.0)
+        self._finish[key] = tag
+        return tag
+
+    @asynccontextmanager
+    async def slot(self, priority: int = UPLOAD, tenant: str = ANONYMOUS, cost: float = 1.0):
+        """Hold one slot of this stage for the duration of the block"""
+        priority_name = PRIORITY_NAMES[priority]
+        start = time.perf_counter()
+        if not self._waiting and self._eligible(priority, tenant):
+            self._tag(priority, tenant, cost)
+            self._grant(priority, tenant)
+        else:
+            if self.max_queue and len(self._waiting) >= self.max_queue:
+                raise SchedulerBusy(self.stage)
+            waiter = _Waiter(
+                priority, tenant, self._tag(priority, tenant, cost), next(self._seq),
+                asyncio.get_running_loop().create_future(),
+            )
+            self._waiting.append(waiter)
+            SCHED_QUEUED.labels(self.stage, priority_name).inc()
+            # A waiter that cannot run yet must not block eligible ones behind it
+            self._dispatch()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self._release(priority, tenant)  # granted just as we were cancelled
+                else:
+                    self._waiting.remove(waiter)
+                    SCHED_QUEUED.labels(self.stage, priority_name).dec()
+                raise
+        SCHED_WAIT_SECONDS.labels(self.stage, priority_name).observe(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(priority, tenant)
+
+
+def _from_env(stage: str, default_slots: int) -> StageScheduler:
+    prefix = f"SCHED_{stage.upper()}"
+    batch_slots = os.getenv(f"{prefix}_BATCH_SLOTS")
+    return StageScheduler(
+        stage,
+        slots=int(os.getenv(f"{prefix}_SLOTS", str(default_slots))),
+        batch_slots=int(batch_slots) if batch_slots else None,
+        max_queue=int(os.getenv("SCHED_MAX_QUEUE", "0")),
+        tenant_max_inflight=int(os.getenv("SCHED_TENANT_MAX_INFLIGHT", "0")),
+        weights=parse_weights(os.getenv("SCHED_TENANT_WEIGHTS", "")),
+    )
+
+
+whisper_scheduler = _from_env("whisper", 2)
+llm_scheduler = _from_env("llm", 4)
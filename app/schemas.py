@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime
 
@@ -7,7 +7,7 @@ class InterviewLogCreate(BaseModel):
     transcription: str
     candidate_name: Optional[str]
     skills: Optional[List[str]]
-    years_experience: Optional[int]
+    years_experience: Optional[float]
     desired_role: Optional[str]
     selected_faq: Optional[Dict]
 
@@ -16,4 +16,22 @@ class InterviewLogResponse(InterviewLogCreate):
     timestamp: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class InterviewLogPage(BaseModel):
+    items: List[Dict]
+    next_cursor: Optional[str] = None
+
+class FAQItem(BaseModel):
+    question: str
+    answer: str
+
+# Anything outside this range is a misread, not a career
+MAX_YEARS_EXPERIENCE = 60
+
+class ExtractionResult(BaseModel):
+    candidate_name: Optional[str] = None
+    skills: List[str] = []
+    years_experience: Optional[float] = Field(None, ge=0, le=MAX_YEARS_EXPERIENCE)
+    desired_role: Optional[str] = None
+    faq: List[FAQItem] = []
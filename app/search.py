@@ -0,0 +1,118 @@
+import html
+import re
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+FTS_TABLE = "interview_logs_fts"
+
+# External content FTS5 index over interview_logs: the text lives only in the
+# base table, the triggers below keep the index in step with every write.
+_FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        transcription, candidate_name, desired_role, skills,
+        content='interview_logs', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS interview_logs_fts_ai AFTER INSERT ON interview_logs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, transcription, candidate_name, desired_role, skills)
+        VALUES (new.id, new.transcription, new.candidate_name, new.desired_role, new.skills);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS interview_logs_fts_ad AFTER DELETE ON interview_logs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, transcription, candidate_name, desired_role, skills)
+        VALUES ('delete', old.id, old.transcription, old.candidate_name, old.desired_role, old.skills);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS interview_logs_fts_au AFTER UPDATE ON interview_logs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, transcription, candidate_name, desired_role, skills)
+        VALUES ('delete', old.id, old.transcription, old.candidate_name, old.desired_role, old.skills);
+        INSERT INTO {FTS_TABLE}(rowid, transcription, candidate_name, desired_role, skills)
+        VALUES (new.id, new.transcription, new.candidate_name, new.desired_role, new.skills);
+    END
+    """,
+]
+
+
+# snippet() marks matches with control characters that cannot occur in
+# transcripts; the text is HTML-escaped first and then they become <b></b>
+_MATCH_START, _MATCH_END = "\x02", "\x03"
+
+
+def _highlight(snippet: str) -> str:
+    escaped = html.escape(snippet or "", quote=True)
+    return escaped.replace(_MATCH_START, "<b>").replace(_MATCH_END, "</b>")
+
+
+def setup_fts(engine) -> None:
+    """Create the FTS5 table and sync triggers, backfilling existing rows on first run"""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        for statement in _FTS_SCHEMA:
+            conn.execute(text(statement))
+        if not exists:
+            rebuild_fts(conn)
+
+
+def rebuild_fts(conn) -> None:
+    """Re-index every row of interview_logs from scratch"""
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def to_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    Every word is quoted (so input like C++ or node.js cannot break the
+    query syntax) and all words must match; a trailing * keeps prefix search.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = re.sub(r"[\"*]", "", word)
+        if not word:
+            continue
+        terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_transcripts(db: Session, query: str, limit: int = 20) -> List[dict]:
+    """Ranked full-text search, best match first, with an HTML-safe highlighted transcript snippet"""
+    match = to_match_query(query)
+    if not match:
+        return []
+    rows = db.execute(
+        text(
+            f"""
+            SELECT l.id, l.candidate_name, l.desired_role, l.timestamp,
+                   bm25({FTS_TABLE}) AS score,
+                   snippet({FTS_TABLE}, 0, :start, :end, '...', 16) AS snippet
+            FROM {FTS_TABLE}
+            JOIN interview_logs l ON l.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match
+            ORDER BY score
+            LIMIT :limit
+            """
+        ),
+        {"match": match, "limit": limit, "start": _MATCH_START, "end": _MATCH_END},
+    ).mappings()
+    return [
+        {
+            "id": row["id"],
+            "candidate_name": row["candidate_name"],
+            "desired_role": row["desired_role"],
+            "timestamp": str(row["timestamp"]) if row["timestamp"] else None,
+            # bm25() is lower-is-better; flip it so clients can sort descending
+            "score": -row["score"],
+            "snippet": _highlight(row["snippet"]),
+        }
+        for row in rows
+    ]
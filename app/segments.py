@@ -0,0 +1,198 @@
+"""
+Compact, array-backed transcript segments.
+
+Whisper yields one Python object per segment (and per word when word
+timestamps are on). We keep only what downstream features need, as parallel
+numpy arrays plus one UTF-8 text buffer with offsets, which packs into a small
+zlib-compressed blob for the interview_logs.segments column.
+
+Packed layout (little endian), after a fixed header:
+    header  : magic "SEG1", flags (u8), n_segments (u32), n_words (u32)
+    payload : zlib(start f32[n] | end f32[n] | avg_logprob f32[n] |
+                   text_offsets u32[n+1] | text bytes |
+                   [word_start f32[w] | word_end f32[w] | word_prob f32[w] |
+                    word_segment u32[w] | word_offsets u32[w+1] | word bytes] |
+                   [speaker u8[n]])
+"""
+import struct
+import zlib
+from typing import Callable, List, Optional
+
+import numpy as np
+
+_MAGIC = b"SEG1"
+_HEADER = struct.Struct("<4sBII")
+_HAS_WORDS = 0x01
+_HAS_SPEAKERS = 0x02
+
+# Speaker codes written by app.diarization
+CANDIDATE = 0
+INTERVIEWER = 1
+SPEAKER_LABELS = ("candidate", "interviewer")
+
+
+def _text_buffer(texts: List[str]):
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return b"".join(encoded), offsets
+
+
+class SegmentArray:
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        avg_logprob: np.ndarray,
+        text: bytes,
+        text_offsets: np.ndarray,
+        words: Optional[dict] = None,
+        speakers: Optional[np.ndarray] = None,
+    ):
+        self.start = start
+        self.end = end
+        self.avg_logprob = avg_logprob
+        self.text = text
+        self.text_offsets = text_offsets
+        # word_start/word_end/word_prob/word_segment arrays + word text buffer
+        self.words = words
+        # one speaker code per segment once diarized, else None
+        self.speakers = speakers
+
+    def __len__(self):
+        return len(self.start)
+
+    @classmethod
+    def from_whisper(cls, segments, time_map: Optional[Callable[[float], float]] = None) -> "SegmentArray":
+        """Build from faster-whisper segments; time_map re-bases timestamps (e.g. after VAD trimming)"""
+        time_map = time_map or (lambda t: t)
+        starts, ends, logprobs, texts = [], [], [], []
+        w_start, w_end, w_prob, w_seg, w_text = [], [], [], [], []
+        for i, segment in enumerate(segments):
+            starts.append(time_map(segment.start))
+            ends.append(time_map(segment.end))
+            logprobs.append(segment.avg_logprob)
+            texts.append(segment.text.strip())
+            for word in segment.words or []:
+                w_start.append(time_map(word.start))
+                w_end.append(time_map(word.end))
+                w_prob.append(word.probability)
+                w_seg.append(i)
+                w_text.append(word.word)
+
+        text, offsets = _text_buffer(texts)
+        words = None
+        if w_start:
+            word_text, word_offsets = _text_buffer(w_text)
+            words = {
+                "start": np.asarray(w_start, dtype=np.float32),
+                "end": np.asarray(w_end, dtype=np.float32),
+                "prob": np.asarray(w_prob, dtype=np.float32),
+                "segment": np.asarray(w_seg, dtype=np.uint32),
+                "text": word_text,
+                "offsets": word_offsets,
+            }
+        return cls(
+            np.asarray(starts, dtype=np.float32),
+            np.asarray(ends, dtype=np.float32),
+            np.asarray(logprobs, dtype=np.float32),
+            text,
+            offsets,
+            words,
+        )
+
+    def segment_text(self, i: int) -> str:
+        return self.text[self.text_offsets[i]:self.text_offsets[i + 1]].decode("utf-8")
+
+    def full_text(self) -> str:
+        return " ".join(self.segment_text(i) for i in range(len(self)))
+
+    def to_list(self, include_words: bool = True) -> List[dict]:
+        """JSON friendly view: one dict per segment, with words when available"""
+        items = [
+            {
+                "start": round(float(self.start[i]), 2),
+                "end": round(float(self.end[i]), 2),
+                "text": self.segment_text(i),
+                "avg_logprob": round(float(self.avg_logprob[i]), 3),
+            }
+            for i in range(len(self))
+        ]
+        if self.speakers is not None:
+            for item, speaker in zip(items, self.speakers):
+                item["speaker"] = SPEAKER_LABELS[int(speaker)]
+        if include_words and self.words is not None:
+            w = self.words
+            for j in range(len(w["start"])):
+                items[int(w["segment"][j])].setdefault("words", []).append({
+                    "start": round(float(w["start"][j]), 2),
+                    "end": round(float(w["end"][j]), 2),
+                    "word": w["text"][w["offsets"][j]:w["offsets"][j + 1]].decode("utf-8"),
+                    "probability": round(float(w["prob"][j]), 3),
+                })
+        return items
+
+    def pack(self) -> bytes:
+        n_words = len(self.words["start"]) if self.words is not None else 0
+        parts = [
+            self.start.astype("<f4").tobytes(),
+            self.end.astype("<f4").tobytes(),
+            self.avg_logprob.astype("<f4").tobytes(),
+            self.text_offsets.astype("<u4").tobytes(),
+            self.text,
+        ]
+        if n_words:
+            w = self.words
+            parts += [
+                w["start"].astype("<f4").tobytes(),
+                w["end"].astype("<f4").tobytes(),
+                w["prob"].astype("<f4").tobytes(),
+                w["segment"].astype("<u4").tobytes(),
+                w["offsets"].astype("<u4").tobytes(),
+                w["text"],
+            ]
+        flags = _HAS_WORDS if n_words else 0
+        if self.speakers is not None:
+            parts.append(self.speakers.astype(np.uint8).tobytes())
+            flags |= _HAS_SPEAKERS
+        header = _HEADER.pack(_MAGIC, flags, len(self), n_words)
+        return header + zlib.compress(b"".join(parts), 6)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "SegmentArray":
+        magic, flags, n, n_words = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a packed segment array")
+        payload = memoryview(zlib.decompress(data[_HEADER.size:]))
+        pos = 0
+
+        def take(dtype, count):
+            nonlocal pos
+            arr = np.frombuffer(payload, dtype=dtype, count=count, offset=pos).copy()
+            pos += arr.nbytes
+            return arr
+
+        def take_bytes(count):
+            nonlocal pos
+            chunk = bytes(payload[pos:pos + count])
+            pos += count
+            return chunk
+
+        start = take("<f4", n)
+        end = take("<f4", n)
+        avg_logprob = take("<f4", n)
+        offsets = take("<u4", n + 1)
+        text = take_bytes(int(offsets[-1]))
+        words = None
+        if flags & _HAS_WORDS:
+            words = {
+                "start": take("<f4", n_words),
+                "end": take("<f4", n_words),
+                "prob": take("<f4", n_words),
+                "segment": take("<u4", n_words),
+                "offsets": take("<u4", n_words + 1),
+            }
+            words["text"] = take_bytes(int(words["offsets"][-1]))
+        speakers = take(np.uint8, n) if flags & _HAS_SPEAKERS else None
+        return cls(start, end, avg_logprob, text, offsets, words, speakers)
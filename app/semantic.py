@@ -0,0 +1,271 @@
+"""
+Semantic candidate search backed by a persistent ChromaDB collection.
+
+Each interview is stored as a handful of transcript chunks plus one "profile"
+document built from the extracted entities. Indexing is incremental (a
+watermark tracks the highest log id already embedded) and the whole index can
+be rebuilt from the database at any time:
+
+    python -m app.semantic update
+    python -m app.semantic rebuild
+
+Chroma's persistent client is not safe to share between processes, so when
+MODEL_SERVER_ADDRESS is set the model server is the index's only owner:
+every read and write below is forwarded to it (it already holds MiniLM), and
+API workers, batch ingest and this CLI never open SEMANTIC_INDEX_DIR.
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import chromadb
+from sqlalchemy.orm import Session
+
+from . import model_server
+from .metrics import configure_logging
+from .models import InterviewLog
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_INDEX_DIR = os.getenv("SEMANTIC_INDEX_DIR", "semantic_index")
+COLLECTION_NAME = "interviews"
+STATE_FILE = os.path.join(SEMANTIC_INDEX_DIR, "index_state.json")
+
+CHUNK_WORDS = 80
+CHUNK_OVERLAP = 20
+INDEX_BATCH_SIZE = 64
+
+_client = None
+_collection = None
+_lock = threading.Lock()
+
+
+def get_collection():
+    """Get or create the global persistent collection (HNSW, cosine distance)"""
+    global _client, _collection
+    if _collection is None:
+        with _lock:
+            if _collection is None:
+                os.makedirs(SEMANTIC_INDEX_DIR, exist_ok=True)
+                _client = chromadb.PersistentClient(path=SEMANTIC_INDEX_DIR)
+                _collection = _client.get_or_create_collection(
+                    COLLECTION_NAME, metadata={"hnsw:space": "cosine"}
+                )
+    return _collection
+
+
+def _read_watermark() -> int:
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f).get("last_indexed_id", 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_watermark(last_id: int) -> None:
+    os.makedirs(SEMANTIC_INDEX_DIR, exist_ok=True)
+    with open(STATE_FILE, "w") as f:
+        json.dump({"last_indexed_id": last_id}, f)
+
+
+def chunk_transcript(transcription: str, size: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """Split a transcript into overlapping word windows small enough for MiniLM"""
+    words = (transcription or "").split()
+    if not words:
+        return []
+    step = max(1, size - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + size]))
+        if start + size >= len(words):
+            break
+    return chunks
+
+
+def profile_document(log: InterviewLog) -> str:
+    parts = [f"Candidate {log.candidate_name or 'Unknown'}."]
+    if log.desired_role:
+        parts.append(f"Desired role: {log.desired_role}.")
+    if log.years_experience is not None:
+        parts.append(f"{log.years_experience} years of experience.")
+    skills = log.get_skills()
+    if skills:
+        parts.append("Skills: " + ", ".join(str(s) for s in skills) + ".")
+    return " ".join(parts)
+
+
+def index_interviews(logs: List[InterviewLog]) -> int:
+    """Embed and upsert a batch of interviews; returns the number of documents written"""
+    if not logs:
+        return 0
+    ids, documents, metadatas = [], [], []
+    for log in logs:
+        ids.append(f"{log.id}:profile")
+        documents.append(profile_document(log))
+        metadatas.append({"log_id": log.id, "kind": "profile"})
+        for i, chunk in enumerate(chunk_transcript(log.transcription)):
+            ids.append(f"{log.id}:seg:{i}")
+            documents.append(chunk)
+            metadatas.append({"log_id": log.id, "kind": "segment"})
+    upsert_documents([log.id for log in logs], ids, documents, metadatas)
+    return len(ids)
+
+
+def upsert_documents(log_ids: List[int], ids: List[str], documents: List[str], metadatas: List[dict]) -> None:
+    """Replace everything indexed for log_ids with the given documents"""
+    if model_server.enabled():
+        model_server.call("semantic_upsert", log_ids, ids, documents, metadatas)
+        return
+
+    from .nlp import get_embeddings
+
+    collection = get_collection()
+    # Drop stale chunks first; a re-indexed transcript may have fewer chunks
+    collection.delete(where={"log_id": {"$in": list(log_ids)}})
+    collection.upsert(
+        ids=ids,
+        embeddings=get_embeddings(documents),
+        documents=documents,
+        metadatas=metadatas,
+    )
+
+
+def remove_interviews(log_ids: List[int]) -> None:
+    if not log_ids:
+        return
+    if model_server.enabled():
+        model_server.call("semantic_remove", list(log_ids))
+        return
+    get_collection().delete(where={"log_id": {"$in": list(log_ids)}})
+
+
+def index_interview_by_id(log_id: int) -> None:
+    """Background-task entry point used right after an interview is logged"""
+    from .db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        log = db.query(InterviewLog).filter(InterviewLog.id == log_id).first()
+        if log is not None:
+            index_interviews([log])
+    except Exception as e:
+        logger.warning("Failed to index interview %s: %s", log_id, e)
+    finally:
+        db.close()
+
+
+def index_new(db: Session, batch_size: int = INDEX_BATCH_SIZE) -> int:
+    """Embed every interview above the watermark, in id order and in batches"""
+    last_id = _read_watermark()
+    indexed = 0
+    while True:
+        logs = (
+            db.query(InterviewLog)
+            .filter(InterviewLog.id > last_id)
+            .order_by(InterviewLog.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not logs:
+            break
+        index_interviews(logs)
+        last_id = logs[-1].id
+        _write_watermark(last_id)
+        indexed += len(logs)
+        logger.info("Indexed %d interviews (up to id %d)", indexed, last_id)
+    return indexed
+
+
+def reset_index() -> None:
+    """Drop the collection; the next write recreates it empty"""
+    global _collection
+    if model_server.enabled():
+        model_server.call("semantic_reset")
+        return
+    collection = get_collection()
+    with _lock:
+        _client.delete_collection(collection.name)
+        _collection = None
+
+
+def rebuild_index(db: Session, batch_size: int = INDEX_BATCH_SIZE) -> int:
+    """Drop the collection and re-embed the whole interview table"""
+    reset_index()
+    _write_watermark(0)
+    return index_new(db, batch_size=batch_size)
+
+
+def _group_hits(results: dict, k: int, exclude: Optional[int] = None) -> List[Dict]:
+    """Collapse chunk-level hits to one entry per interview, keeping its best chunk"""
+    best = {}
+    for doc, meta, distance in zip(
+        results["documents"][0], results["metadatas"][0], results["distances"][0]
+    ):
+        log_id = meta["log_id"]
+        if log_id == exclude:
+            continue
+        score = 1.0 - distance
+        if log_id not in best or score > best[log_id]["score"]:
+            best[log_id] = {"log_id": log_id, "score": score, "match": doc, "kind": meta["kind"]}
+    return sorted(best.values(), key=lambda hit: hit["score"], reverse=True)[:k]
+
+
+def semantic_search(query: str, k: int = 10) -> List[Dict]:
+    if model_server.enabled():
+        return model_server.call("semantic_search", query, k)
+
+    from .nlp import get_embeddings
+
+    collection = get_collection()
+    if collection.count() == 0:
+        return []
+    # Over-fetch chunks so that k distinct interviews survive grouping
+    results = collection.query(
+        query_embeddings=get_embeddings([query]),
+        n_results=min(k * 5, collection.count()),
+        include=["documents", "metadatas", "distances"],
+    )
+    return _group_hits(results, k)
+
+
+def similar_interviews(log_id: int, k: int = 10) -> Optional[List[Dict]]:
+    """Interviews closest to the given one's profile; None if it is not indexed"""
+    if model_server.enabled():
+        return model_server.call("semantic_similar", log_id, k)
+    collection = get_collection()
+    found = collection.get(ids=[f"{log_id}:profile"], include=["embeddings"])
+    if not found["ids"]:
+        return None
+    results = collection.query(
+        query_embeddings=[list(found["embeddings"][0])],
+        n_results=min((k + 1) * 5, collection.count()),
+        include=["documents", "metadatas", "distances"],
+    )
+    return _group_hits(results, k, exclude=log_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the semantic interview index")
+    parser.add_argument("command", choices=["update", "rebuild"])
+    parser.add_argument("--batch-size", type=int, default=INDEX_BATCH_SIZE)
+    args = parser.parse_args()
+    configure_logging()
+
+    from .db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            count = rebuild_index(db, batch_size=args.batch_size)
+        else:
+            count = index_new(db, batch_size=args.batch_size)
+        print(f"[SEMANTIC] Done, {count} interviews indexed")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
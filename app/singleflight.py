@@ -0,0 +1,59 @@
+"""
+Request coalescing for the analysis endpoints.
+
+A double click, or Streamlit rerunning the script, can submit the same audio
+twice at once. Keyed on the audio's sha256, the second request simply awaits
+the first one's in-flight pipeline run instead of paying for Whisper and the
+LLM again, and both get the same result (and therefore the same session_id).
+Keys are forgotten as soon as the run finishes, so this is deduplication of
+concurrent work only, not a cache. TTS uses the same mechanism keyed on the
+output file, so concurrent requests for one answer call edge-tts once.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Tuple
+
+from prometheus_client import Counter
+
+COALESCED = Counter(
+    "analysis_coalesced_total", "Analysis requests served by another request's in-flight run"
+)
+TTS_COALESCED = Counter(
+    "tts_coalesced_total", "TTS requests served by another request's in-flight synthesis"
+)
+
+
+class SingleFlight:
+    def __init__(self, coalesced: Counter = COALESCED):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._coalesced = coalesced
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, so an error nobody awaited is not logged as lost
+
+    async def do(self, key: str, fn: Callable, *args) -> Tuple[Any, bool]:
+        """
+        Run fn(*args) (awaited if it is a coroutine function, else in a worker
+        thread), unless a run for `key` is already in flight, in which case
+        wait for that one. Returns (result, shared).
+        A cancelled caller (e.g. a client disconnect) does not cancel the run
+        the other callers are waiting on.
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        if shared:
+            self._coalesced.inc()
+        else:
+            if asyncio.iscoroutinefunction(fn):
+                task = asyncio.ensure_future(fn(*args))
+            else:
+                task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task), shared
+
+
+analysis_flight = SingleFlight()
+tts_flight = SingleFlight(TTS_COALESCED)
@@ -1,30 +1,34 @@
 import asyncio
+import logging
 import os
 from edge_tts import Communicate
+from .metrics import stage_span
+
+logger = logging.getLogger(__name__)
+
+VOICE = "en-US-AriaNeural"
+FALLBACK_VOICE = "en-US-JennyNeural"
 
 async def text_to_speech(text: str, output_path: str) -> None:
     try:
-        print(f"Starting TTS for text: {text[:50]}...")
-        
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Create communicate object
-        communicate = Communicate(text, "en-US-AriaNeural")
-        
-        # Save audio file
-        await communicate.save(output_path)
-        
-        print(f"TTS completed successfully: {output_path}")
+        with stage_span("tts", chars=len(text)):
+            # Create communicate object
+            communicate = Communicate(text, VOICE)
+            
+            # Save audio file
+            await communicate.save(output_path)
         
     except Exception as e:
-        print(f"TTS error: {e}")
+        logger.warning("TTS error: %s", e)
         # Try with a different voice if the first one fails
         try:
-            print("Trying alternative voice...")
-            communicate = Communicate(text, "en-US-JennyNeural")
-            await communicate.save(output_path)
-            print(f"TTS completed with alternative voice: {output_path}")
+            logger.info("Retrying TTS with alternative voice")
+            with stage_span("tts", chars=len(text), voice="fallback"):
+                communicate = Communicate(text, FALLBACK_VOICE)
+                await communicate.save(output_path)
         except Exception as e2:
-            print(f"TTS failed with alternative voice: {e2}")
-            raise Exception(f"TTS failed: {str(e2)}") 
\ No newline at end of file
+            logger.error("TTS failed with alternative voice: %s", e2)
+            raise Exception(f"TTS failed: {str(e2)}")
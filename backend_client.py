@@ -0,0 +1,118 @@
+"""
+HTTP client for the Streamlit front end.
+
+Streamlit re-runs the whole script on every interaction, so anything fetched
+inline is fetched again on each click. Here all calls share one pooled
+keep-alive session (st.cache_resource), and the results that don't change
+between reruns are cached with a TTL (st.cache_data): backend health, the
+sample list and synthesized FAQ audio.
+"""
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BACKEND_BASE_URL = os.getenv("BACKEND_BASE_URL", "http://127.0.0.1:8000")
+UPLOAD_URL = f"{BACKEND_BASE_URL}/upload-audio-json/"
+# Sent as X-API-Key so the backend can schedule this UI fairly among clients
+BACKEND_API_KEY = os.getenv("BACKEND_API_KEY")
+
+STREAM_CHUNK_BYTES = 64 * 1024
+MAX_AUDIO_BYTES = 50 * 1024 * 1024
+
+
+class BackendError(Exception):
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One keep-alive connection pool for the whole Streamlit server"""
+    session = requests.Session()
+    # Only idempotent GETs are retried; a retried POST could run the pipeline twice
+    retry = Retry(total=2, backoff_factor=0.3, allowed_methods={"GET"}, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if BACKEND_API_KEY:
+        session.headers["X-API-Key"] = BACKEND_API_KEY
+    return session
+
+
+def _request(method: str, path: str, **kwargs) -> requests.Response:
+    response = get_session().request(method, f"{BACKEND_BASE_URL}{path}", **kwargs)
+    if response.status_code != 200:
+        raise BackendError(response.status_code, response.text)
+    return response
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def backend_online() -> bool:
+    try:
+        get_session().get(f"{BACKEND_BASE_URL}/health", timeout=3).raise_for_status()
+        return True
+    except requests.RequestException:
+        return False
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def sample_audio_files() -> dict:
+    return _request("GET", "/sample-audio-files", timeout=10).json()["sample_files"]
+
+
+def test_sample(sample_id: str) -> dict:
+    return _request("POST", f"/test-sample-audio/{sample_id}", timeout=300).json()
+
+
+def upload_audio(filename: str, fileobj, mime_type: str) -> dict:
+    # requests streams the file object into the multipart body
+    files = {"file": (filename, fileobj, mime_type)}
+    return _request("POST", "/upload-audio-json/", files=files, timeout=300).json()
+
+
+def answer_questions(transcription: str, questions: list) -> list:
+    """All questions in one request: the transcript is uploaded once, not once per question"""
+    payload = {"transcription": transcription, "questions": questions}
+    return _request("POST", "/answer-manual-faq/batch", json=payload, timeout=180).json()["answers"]
+
+
+def tts_batch(texts: list) -> list:
+    """Synthesize many answers concurrently; one {"audio_url", "error"} per text"""
+    return _request("POST", "/tts/batch", json={"texts": texts}, timeout=180).json()["results"]
+
+
+def download(path: str, max_bytes: int = MAX_AUDIO_BYTES) -> bytes:
+    """Stream a file from the backend in chunks rather than buffering the raw response twice"""
+    with get_session().get(f"{BACKEND_BASE_URL}{path}", stream=True, timeout=60) as response:
+        if response.status_code != 200:
+            raise BackendError(response.status_code, response.reason)
+        data = bytearray()
+        for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+            data.extend(chunk)
+            if len(data) > max_bytes:
+                raise BackendError(413, f"Download larger than {max_bytes} bytes")
+        return bytes(data)
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def faq_audio(question: str, answer: str) -> bytes:
+    """Synthesize (once) and download the spoken answer for one FAQ"""
+    tts = _request("POST", "/tts-for-faq/", json={"faq": {"question": question, "answer": answer}}, timeout=60).json()
+    audio_url = tts.get("audio_url")
+    if not audio_url:
+        raise BackendError(500, "TTS response had no audio_url")
+    return download(audio_url)
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def answers_audio(answers: tuple) -> list:
+    """Spoken answers for several texts with one synthesis request; None where TTS failed"""
+    audio = []
+    for result in tts_batch(list(answers)):
+        audio.append(download(result["audio_url"]) if result["audio_url"] else None)
+    return audio
@@ -0,0 +1,50 @@
+"""
+extract_entities latency against a fake LLM with a fixed response latency.
+
+The difference between the measured latency and --llm-latency is our own
+prompt building, response parsing and normalisation overhead.
+
+    python -m benchmarks.bench_extract --llm-latency 0.5 --iterations 50
+"""
+import argparse
+
+from .common import Timer, summarize, write_result
+from .fakes import install_fake_llm
+
+TRANSCRIPT = (
+    "Hi, my name is Benchmark Candidate. I have three years of experience as a backend "
+    "engineer working mostly with Python, PostgreSQL and Docker. I'm applying for the "
+    "backend engineer role. "
+) * 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_entities with a fake LLM")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--transcript-repeat", type=int, default=1,
+                        help="Multiply the transcript length")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    install_fake_llm(args.llm_latency)
+    from app.nlp import extract_entities
+
+    transcript = TRANSCRIPT * args.transcript_repeat
+    latencies = []
+    for _ in range(args.iterations):
+        with Timer() as t:
+            extract_entities(transcript)
+        latencies.append(t.elapsed)
+
+    summary = summarize(latencies)
+    write_result(
+        "extract",
+        {"llm_latency": args.llm_latency, "iterations": args.iterations, "transcript_chars": len(transcript)},
+        {"latency": summary, "overhead_p50": summary["p50"] - args.llm_latency},
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
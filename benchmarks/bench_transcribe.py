@@ -0,0 +1,72 @@
+"""
+Real-time factor of transcribe_audio per Whisper model size and compute type.
+
+    python -m benchmarks.bench_transcribe --models tiny,base,small --compute-types int8,float32
+"""
+import argparse
+import gc
+
+from faster_whisper import WhisperModel
+from faster_whisper.audio import decode_audio
+
+from app import audio_utils
+from .common import Timer, sample_audio_files, summarize, write_result
+
+
+def bench_config(model_size, compute_type, files, repeat):
+    with Timer() as load:
+        model = WhisperModel(model_size, device="cpu", compute_type=compute_type)
+    audio_utils._whisper_model = model
+
+    audio = {path: decode_audio(path, sampling_rate=audio_utils.SAMPLE_RATE) for path in files}
+    # one untimed pass so lazy initialisation doesn't count against the first file
+    audio_utils.transcribe_audio(audio[files[0]])
+
+    rtfs, latencies, audio_seconds = [], [], 0.0
+    for _ in range(repeat):
+        for path in files:
+            duration = len(audio[path]) / audio_utils.SAMPLE_RATE
+            with Timer() as t:
+                audio_utils.transcribe_audio(audio[path])
+            latencies.append(t.elapsed)
+            rtfs.append(t.elapsed / duration)
+            audio_seconds += duration
+
+    audio_utils._whisper_model = None
+    del model
+    gc.collect()
+    return {
+        "model": model_size,
+        "compute_type": compute_type,
+        "load_seconds": load.elapsed,
+        "audio_seconds": audio_seconds,
+        "latency": summarize(latencies),
+        "rtf": summarize(rtfs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", default="tiny,base,small")
+    parser.add_argument("--compute-types", default="int8,float32")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    files = sample_audio_files()
+    results = [
+        bench_config(model, compute_type, files, args.repeat)
+        for model in args.models.split(",")
+        for compute_type in args.compute_types.split(",")
+    ]
+    write_result(
+        "transcribe",
+        {"models": args.models, "compute_types": args.compute_types, "repeat": args.repeat,
+         "files": [p.rsplit("/", 1)[-1] for p in files]},
+        results,
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
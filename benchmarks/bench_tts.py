@@ -0,0 +1,58 @@
+"""
+text_to_speech latency and throughput against a fake synthesiser.
+
+    python -m benchmarks.bench_tts --tts-latency 0.3 --concurrency 1,4,16
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from .common import summarize, write_result
+from .fakes import install_fake_tts
+
+ANSWER = "The candidate has three years of backend experience with Python and PostgreSQL."
+
+
+async def run_level(text_to_speech, out_dir, concurrency, total):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await text_to_speech(ANSWER, os.path.join(out_dir, f"bench_{concurrency}_{i}.mp3"))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    wall = time.perf_counter() - start
+    return {"concurrency": concurrency, "latency": summarize(latencies), "throughput_rps": total / wall}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text_to_speech with a fake synthesiser")
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    install_fake_tts(args.tts_latency)
+    from app.tts import text_to_speech
+
+    results = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for level in (int(c) for c in args.concurrency.split(",")):
+            results.append(asyncio.run(run_level(text_to_speech, out_dir, level, args.requests)))
+    write_result(
+        "tts",
+        {"tts_latency": args.tts_latency, "requests": args.requests},
+        results,
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
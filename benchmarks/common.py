@@ -0,0 +1,81 @@
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_AUDIO_DIR = os.path.join(REPO_ROOT, "sample_audio")
+
+
+def sample_audio_files():
+    return sorted(
+        os.path.join(SAMPLE_AUDIO_DIR, name)
+        for name in os.listdir(SAMPLE_AUDIO_DIR)
+        if name.lower().endswith(".wav")
+    )
+
+
+def _git(*args):
+    try:
+        return subprocess.check_output(["git", *args], cwd=REPO_ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def environment():
+    """Enough context to decide whether two result files are comparable"""
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": values[0],
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def write_result(name, config, results, out=None):
+    """Print the result envelope as JSON and optionally save it to a file"""
+    payload = {"benchmark": name, "environment": environment(), "config": config, "results": results}
+    text = json.dumps(payload, indent=2)
+    if out:
+        with open(out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return payload
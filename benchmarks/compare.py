@@ -0,0 +1,63 @@
+"""
+Compare two benchmark result files and flag latency regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Every numeric p50/p95/p99/mean/rtf value found in both files is compared;
+the exit status is 1 if any grew by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+WATCHED = {"p50", "p95", "p99", "mean"}
+
+
+def flatten(node, prefix=""):
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, list):
+        for i, value in enumerate(node):
+            label = value.get("model", value.get("concurrency", i)) if isinstance(value, dict) else i
+            if isinstance(value, dict) and "compute_type" in value:
+                label = f"{label}/{value['compute_type']}"
+            yield from flatten(value, f"{prefix}[{label}]")
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield prefix, node
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag regressions between two benchmark runs")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    if baseline["benchmark"] != candidate["benchmark"]:
+        sys.exit(f"Different benchmarks: {baseline['benchmark']} vs {candidate['benchmark']}")
+    if baseline["environment"].get("machine") != candidate["environment"].get("machine"):
+        print("warning: results come from different machine types")
+
+    before = dict(flatten(baseline["results"]))
+    after = dict(flatten(candidate["results"]))
+    regressions = 0
+    for key in sorted(before.keys() & after.keys()):
+        if key.rsplit(".", 1)[-1] not in WATCHED or not before[key]:
+            continue
+        change = (after[key] - before[key]) / before[key]
+        flag = "REGRESSION" if change > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{key:<50} {before[key]:10.4f} -> {after[key]:10.4f} {change:+7.1%} {flag}")
+
+    print(f"\n{baseline['environment'].get('commit')} -> {candidate['environment'].get('commit')}: "
+          f"{regressions} regression(s)")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Run the real FastAPI backend with Gemini and edge-tts replaced by local fakes,
+so load tests need no network access or API quota. Whisper runs for real; pick
+a small model with WHISPER_MODEL_SIZE=tiny to keep runs short.
+
+    python -m benchmarks.fake_server --llm-latency 0.5 --port 8001
+"""
+import argparse
+import os
+
+from .fakes import install_fake_llm, install_fake_tts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the backend with fake LLM/TTS")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    install_fake_llm(args.llm_latency)
+    install_fake_tts(args.tts_latency)
+
+    import uvicorn
+    from app.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
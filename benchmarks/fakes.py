@@ -0,0 +1,71 @@
+"""
+Offline stand-ins for the Gemini client and edge-tts.
+
+Both keep the real call shape (``genai.GenerativeModel(...).generate_content``
+and ``Communicate(text, voice).save(path)``) but only sleep for a configurable
+latency, so benchmarks measure our own overhead and concurrency behaviour.
+"""
+import asyncio
+import json
+import time
+
+FAKE_EXTRACTION = {
+    "candidate_name": "Benchmark Candidate",
+    "skills": ["Python", "SQL", "Docker"],
+    "years_experience": 3,
+    "desired_role": "Backend Engineer",
+    "faq": [
+        {"question": "What is the candidate's backend experience?", "answer": "Three years building Python services."},
+        {"question": "Which databases have they used?", "answer": "PostgreSQL and SQLite."},
+        {"question": "Do they have container experience?", "answer": "Yes, Docker in production."},
+    ],
+}
+
+# A single silent MPEG-1 Layer III frame, enough for players to accept the file
+SILENT_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    latency = 0.5
+
+    def __init__(self, model_name, *args, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, *args, **kwargs):
+        time.sleep(self.latency)
+        if "Respond ONLY with a valid JSON" in str(prompt):
+            return FakeResponse("```json\n" + json.dumps(FAKE_EXTRACTION) + "\n```")
+        return FakeResponse("The candidate has three years of backend experience.")
+
+
+class FakeCommunicate:
+    latency = 0.3
+    frames = 40
+
+    def __init__(self, text, voice, *args, **kwargs):
+        self.text = text
+        self.voice = voice
+
+    async def save(self, path):
+        await asyncio.sleep(self.latency)
+        with open(path, "wb") as f:
+            f.write(SILENT_MP3_FRAME * self.frames)
+
+
+def install_fake_llm(latency: float = 0.5) -> None:
+    import google.generativeai as genai
+
+    FakeGenerativeModel.latency = latency
+    genai.GenerativeModel = FakeGenerativeModel
+
+
+def install_fake_tts(latency: float = 0.3) -> None:
+    from app import tts
+
+    FakeCommunicate.latency = latency
+    tts.Communicate = FakeCommunicate
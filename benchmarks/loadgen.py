@@ -0,0 +1,125 @@
+"""
+Closed-loop load generator for the analysis endpoints.
+
+Each of --concurrency workers sends requests back to back until --requests
+have completed, then latency percentiles and throughput are reported as JSON.
+
+Uploads of identical bytes coalesce into one pipeline run on the server
+(app/singleflight.py), so by default every upload gets a random JUNK chunk
+appended to its WAV, which makes each payload distinct without changing the
+audio. --repeat-uploads sends the sample files unchanged, to measure the
+coalesced path instead.
+
+Sample requests are answered from the server's warm sample cache, so they
+only measure cache hits; --refresh sends ?refresh=true to run the full
+pipeline on every request. Concurrent refreshes of the same clip still share
+one run (single-flight on the audio hash), so use --concurrency 1 for
+per-request pipeline latency.
+
+    python -m benchmarks.loadgen --endpoint upload --concurrency 4 --requests 40
+    python -m benchmarks.loadgen --endpoint sample --sample-id ananya --concurrency 8
+"""
+import argparse
+import itertools
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .common import sample_audio_files, summarize, write_result
+
+
+def unique_wav(data: bytes) -> bytes:
+    """The same WAV with a random trailing JUNK chunk, so its hash differs on every call"""
+    junk = b"JUNK" + struct.pack("<I", 16) + os.urandom(16)
+    if len(data) % 2:
+        junk = b"\0" + junk  # RIFF chunks start on even offsets
+    riff_size = struct.unpack("<I", data[4:8])[0] + len(junk)
+    return data[:4] + struct.pack("<I", riff_size) + data[8:] + junk
+
+
+def make_request_fn(args):
+    files = sample_audio_files()
+    payloads = {path: open(path, "rb").read() for path in files}
+    cycle = itertools.cycle(files)
+    cycle_lock = threading.Lock()
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def upload():
+        with cycle_lock:
+            path = next(cycle)
+        payload = payloads[path] if args.repeat_uploads else unique_wav(payloads[path])
+        files_arg = {"file": (os.path.basename(path), payload, "audio/wav")}
+        return session().post(f"{args.url}/upload-audio-json/", files=files_arg, timeout=args.timeout)
+
+    def sample():
+        params = {"refresh": "true"} if args.refresh else None
+        return session().post(f"{args.url}/test-sample-audio/{args.sample_id}", params=params, timeout=args.timeout)
+
+    return upload if args.endpoint == "upload" else sample
+
+
+def run(args):
+    send = make_request_fn(args)
+    latencies, errors = [], []
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def worker():
+        while next(counter) < args.requests:
+            start = time.perf_counter()
+            try:
+                response = send()
+                ok = response.status_code == 200
+                detail = response.status_code
+            except requests.RequestException as e:
+                ok, detail = False, type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                (latencies if ok else errors).append(elapsed if ok else str(detail))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - start
+
+    return {
+        "latency": summarize(latencies),
+        "errors": len(errors),
+        "error_kinds": sorted(set(errors)),
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the analysis endpoints")
+    parser.add_argument("--url", default="http://127.0.0.1:8001")
+    parser.add_argument("--endpoint", choices=["upload", "sample"], default="upload")
+    parser.add_argument("--sample-id", default="ananya")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--repeat-uploads", action="store_true",
+                        help="Send identical upload bytes, so concurrent uploads coalesce on the server")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Bypass the sample cache (?refresh=true) so sample requests run the pipeline")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    results = run(args)
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    write_result(f"load_{args.endpoint}", config, results, args.out)
+
+
+if __name__ == "__main__":
+    main()
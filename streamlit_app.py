@@ -1,9 +1,8 @@
 import streamlit as st
-import requests
-import tempfile
-import os
 import json
 from datetime import datetime
+import backend_client
+from backend_client import BACKEND_BASE_URL, BackendError
 
 # Page configuration
 st.set_page_config(
@@ -78,17 +77,12 @@ if 'chat_history' not in st.session_state:
 if 'recording_results' not in st.session_state:
     st.session_state.recording_results = None
 
-# Backend URL
-BACKEND_BASE_URL = "http://127.0.0.1:8000"
-BACKEND_URL = f"{BACKEND_BASE_URL}/upload-audio-json/"
+# Backend URL (see backend_client.py; override with BACKEND_BASE_URL)
+BACKEND_URL = backend_client.UPLOAD_URL
 
 def check_backend_status():
-    """Check if backend is online"""
-    try:
-        response = requests.get(f"{BACKEND_BASE_URL}/health", timeout=3)
-        return response.status_code == 200
-    except:
-        return False
+    """Check if backend is online (cached for a few seconds across reruns)"""
+    return backend_client.backend_online()
 
 def login_system(password):
     """Simple authentication system"""
@@ -346,11 +340,13 @@ def main():
                 st.session_state.sample_processed = False
                 st.session_state.processing_result = None
             
-            # Fetch available sample files
+            # Fetch available sample files (cached, so reruns don't refetch)
             try:
-                sample_response = requests.get(f"{BACKEND_BASE_URL}/sample-audio-files", timeout=10)
-                if sample_response.status_code == 200:
-                    sample_files = sample_response.json()["sample_files"]
+                try:
+                    sample_files = backend_client.sample_audio_files()
+                except BackendError:
+                    sample_files = None
+                if sample_files is not None:
                     
                     # Create a selection box for sample files
                     sample_options = {f"{k}: {v['description']} ({v['size']})": k for k, v in sample_files.items()}
@@ -370,20 +366,14 @@ def main():
                             with st.spinner("Processing sample audio... This may take a moment."):
                                 try:
                                     # Test the sample audio
-                                    test_response = requests.post(
-                                        f"{BACKEND_BASE_URL}/test-sample-audio/{sample_id}",
-                                        timeout=300
-                                    )
-                                    
-                                    if test_response.status_code == 200:
-                                        result = test_response.json()
-                                        st.session_state.processing_result = result
-                                        st.session_state.sample_processed = True
-                                        st.success("✅ Sample audio processed successfully!")
-                                        st.rerun()
-                                    else:
-                                        st.error(f"Error processing sample: {test_response.status_code} - {test_response.text}")
-                                        st.session_state.processing_result = None
+                                    result = backend_client.test_sample(sample_id)
+                                    st.session_state.processing_result = result
+                                    st.session_state.sample_processed = True
+                                    st.success("✅ Sample audio processed successfully!")
+                                    st.rerun()
+                                except BackendError as e:
+                                    st.error(f"Error processing sample: {e}")
+                                    st.session_state.processing_result = None
                                 except Exception as e:
                                     st.error(f"An error occurred: {e}")
                                     st.session_state.processing_result = None
@@ -429,28 +419,19 @@ def main():
             if uploaded_file is not None:
                 if not st.session_state.get('file_processed', False):
                     st.success("New audio file detected! Processing...")
-                    with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp_file:
-                        tmp_file.write(uploaded_file.read())
-                        tmp_file_path = tmp_file.name
                     with st.spinner("Performing one-time analysis... This may take a moment."):
                         try:
-                            with open(tmp_file_path, "rb") as f:
-                                files = {"file": (uploaded_file.name, f, uploaded_file.type)}
-                                json_response = requests.post(BACKEND_URL, files=files, timeout=300)
-                                
-                                if json_response.status_code == 200:
-                                    result = json_response.json()
-                                    st.session_state.processing_result = result
-                                    st.session_state.file_processed = True # Mark as processed
-                                else:
-                                    st.error(f"Error processing audio: {json_response.status_code} - {json_response.text}")
-                                    st.session_state.processing_result = None
+                            # The upload is already in memory; stream it straight to the backend
+                            uploaded_file.seek(0)
+                            result = backend_client.upload_audio(uploaded_file.name, uploaded_file, uploaded_file.type)
+                            st.session_state.processing_result = result
+                            st.session_state.file_processed = True # Mark as processed
+                        except BackendError as e:
+                            st.error(f"Error processing audio: {e}")
+                            st.session_state.processing_result = None
                         except Exception as e:
                             st.error(f"An error occurred: {e}")
                             st.session_state.processing_result = None
-                        finally:
-                            if os.path.exists(tmp_file_path):
-                                os.unlink(tmp_file_path)
                     st.rerun() # Rerun once to display results cleanly
 
             # Display results if they exist in the session state
@@ -499,23 +480,11 @@ def main():
                     if selected_question:
                         with st.spinner("Generating audio for the answer..."):
                             try:
-                                selected_faq_obj = {"question": selected_question, "answer": faq_dict[selected_question]}
-                                tts_response = requests.post(
-                                    f"{BACKEND_BASE_URL}/tts-for-faq/",
-                                    json={"faq": selected_faq_obj},
-                                    timeout=60
-                                )
-                                if tts_response.status_code == 200:
-                                    tts_data = tts_response.json()
-                                    tts_audio_url = tts_data.get("audio_url")
-                                    if tts_audio_url:
-                                        audio_response = requests.get(f"{BACKEND_BASE_URL}{tts_audio_url}")
-                                        if audio_response.status_code == 200:
-                                            st.audio(audio_response.content, format="audio/mp3")
-                                        else:
-                                            st.error(f"Error fetching TTS audio: {audio_response.status_code}")
-                                else:
-                                    st.error(f"TTS generation failed: {tts_response.status_code} - {tts_response.text}")
+                                # Cached per question/answer, so replaying an answer costs no TTS call
+                                audio_bytes = backend_client.faq_audio(selected_question, faq_dict[selected_question])
+                                st.audio(audio_bytes, format="audio/mp3")
+                            except BackendError as e:
+                                st.error(f"TTS generation failed: {e}")
                             except Exception as e:
                                 st.error(f"Error during TTS generation: {str(e)}")
             else:
@@ -530,72 +499,65 @@ def main():
 
             # This form structure is now correct and will not lose the input
             with st.form(key="manual_faq_form"):
-                st.text_input(
-                    "Enter your own question about the transcript:",
+                st.text_area(
+                    "Enter your own questions about the transcript (one per line):",
                     key="manual_question_input"  # The key that saves the input state
                 )
-                submit_button = st.form_submit_button("Get Answer for Custom Question")
+                submit_button = st.form_submit_button("Get Answers for Custom Questions")
 
                 if submit_button:
                     # We read the value from session_state, which is preserved
-                    manual_question = st.session_state.get("manual_question_input", "").strip()
-                    if manual_question and transcription:
-                        with st.spinner("Getting answer from AI..."):
+                    manual_questions = [
+                        line.strip() for line in st.session_state.get("manual_question_input", "").splitlines()
+                        if line.strip()
+                    ]
+                    # A new set of answers invalidates any audio made for the old ones
+                    st.session_state.manual_faq_audio = None
+                    if manual_questions and transcription:
+                        with st.spinner("Getting answers from AI..."):
                             try:
-                                response = requests.post(
-                                    f"{BACKEND_BASE_URL}/answer-manual-faq/",
-                                    json={"transcription": transcription, "question": manual_question},
-                                    timeout=120
+                                # One request (and one LLM call) for all questions
+                                st.session_state.manual_faq_results = backend_client.answer_questions(
+                                    transcription, manual_questions
                                 )
-                                if response.status_code == 200:
-                                    # We save the result and clear any old audio
-                                    st.session_state.manual_faq_result = {
-                                        "question": manual_question,
-                                        "answer": response.json().get("answer")
-                                    }
-                                else:
-                                    st.error(f"Failed to get answer: {response.text}")
-                                    st.session_state.manual_faq_result = None
+                            except BackendError as e:
+                                st.error(f"Failed to get answers: {e.text}")
+                                st.session_state.manual_faq_results = None
                             except Exception as e:
                                 st.error(f"An error occurred: {e}")
-                                st.session_state.manual_faq_result = None
+                                st.session_state.manual_faq_results = None
                     else:
                         st.warning("Please enter a question.")
-                        st.session_state.manual_faq_result = None
-                    
-                    # Force a single rerun to update the display -- THIS WAS THE BUG
-                    # st.rerun() # REMOVING THIS LINE
+                        st.session_state.manual_faq_results = None
 
             # The display logic is now outside the form and reads from the session state
-            if 'manual_faq_result' in st.session_state and st.session_state.manual_faq_result:
-                manual_faq = st.session_state.manual_faq_result
-                st.markdown(f"**Q: {manual_faq['question']}**")
-                st.info(f"**A:** {manual_faq['answer']}")
-                
-                if st.button("🔊 Generate Audio for Custom Answer", key="tts_for_manual_faq"):
+            if st.session_state.get("manual_faq_results"):
+                manual_faqs = st.session_state.manual_faq_results
+                for manual_faq in manual_faqs:
+                    st.markdown(f"**Q: {manual_faq['question']}**")
+                    st.info(f"**A:** {manual_faq['answer']}")
+
+                if st.button("🔊 Generate Audio for Custom Answers", key="tts_for_manual_faq"):
                     with st.spinner("Generating audio..."):
                         try:
-                            tts_response = requests.post(
-                                f"{BACKEND_BASE_URL}/tts-for-faq/",
-                                json={"faq": manual_faq},
-                                timeout=60
+                            # All answers are synthesized concurrently by one request;
+                            # saved to state to prevent them from disappearing
+                            st.session_state.manual_faq_audio = backend_client.answers_audio(
+                                tuple(manual_faq["answer"] for manual_faq in manual_faqs)
                             )
-                            if tts_response.status_code == 200:
-                                tts_data = tts_response.json()
-                                tts_audio_url = tts_data.get("audio_url")
-                                if tts_audio_url:
-                                    audio_response = requests.get(f"{BACKEND_BASE_URL}{tts_audio_url}")
-                                    if audio_response.status_code == 200:
-                                        # Save audio to state to prevent it from disappearing
-                                        st.session_state.manual_faq_audio = audio_response.content
-                            else:
-                                st.error(f"TTS generation failed: {tts_response.text}")
+                        except BackendError as e:
+                            st.error(f"TTS generation failed: {e.text}")
                         except Exception as e:
                             st.error(f"Error generating TTS: {e}")
-                
+
                 # Display the audio if it exists in the state
-                if 'manual_faq_audio' in st.session_state and st.session_state.manual_faq_audio:
-                    st.audio(st.session_state.manual_faq_audio, format="audio/mp3")
+                if st.session_state.get("manual_faq_audio"):
+                    for manual_faq, audio_bytes in zip(manual_faqs, st.session_state.manual_faq_audio):
+                        st.caption(manual_faq["question"])
+                        if audio_bytes:
+                            st.audio(audio_bytes, format="audio/mp3")
+                        else:
+                            st.warning("Audio could not be generated for this answer.")
 
         else:
             st.info("Process an audio file or test with a sample first to ask a custom question.")
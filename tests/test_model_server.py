@@ -0,0 +1,91 @@
+"""
+The model server launched the documented way (`python -m app.model_server`)
+must answer RPCs itself rather than forwarding them to its own socket.
+
+Whisper and MiniLM are replaced with small fakes inside the server process,
+so the test needs the server's dependencies installed but no model downloads.
+"""
+import os
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Client
+
+import pytest
+
+pytest.importorskip("faster_whisper")
+pytest.importorskip("google.generativeai")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs the module exactly as `python -m` does, after swapping in fake models
+BOOTSTRAP = """
+import runpy, sys, types
+import numpy as np
+
+class FakeSentenceModel:
+    def __init__(self, name):
+        pass
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        return np.full((len(texts), 4), 0.5, dtype=np.float32)
+
+sys.modules["sentence_transformers"] = types.SimpleNamespace(SentenceTransformer=FakeSentenceModel)
+import faster_whisper
+faster_whisper.WhisperModel = lambda *args, **kwargs: object()
+
+sys.argv = ["app.model_server", "--address", sys.argv[1]]
+runpy.run_module("app.model_server", run_name="__main__", alter_sys=True)
+"""
+
+AUTHKEY = "test-model-server-key"
+
+
+@pytest.fixture
+def model_server(tmp_path):
+    address = str(tmp_path / "models.sock")
+    env = dict(
+        os.environ,
+        MODEL_SERVER_ADDRESS=address,
+        MODEL_SERVER_AUTHKEY=AUTHKEY,
+        PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])),
+    )
+    process = subprocess.Popen([sys.executable, "-c", BOOTSTRAP, address], cwd=tmp_path, env=env)
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(address):
+            assert process.poll() is None, "model server exited during startup"
+            assert time.monotonic() < deadline, "model server did not start"
+            time.sleep(0.1)
+        yield address
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_embed_is_served_locally(model_server):
+    with Client(model_server, authkey=AUTHKEY.encode()) as conn:
+        conn.send(("embed", (["backend engineer", "data scientist"],)))
+        status, result = conn.recv()
+        assert status == "ok", result
+        assert result == [[0.5] * 4, [0.5] * 4]
+
+        # The server is still healthy afterwards (no leaked self-connections)
+        conn.send(("ping", ()))
+        assert conn.recv() == ("ok", "pong")
+
+
+
+def test_semantic_index_is_owned_by_the_server(model_server, monkeypatch):
+    pytest.importorskip("chromadb")
+    from app import model_server as client, semantic
+
+    monkeypatch.setattr(client, "MODEL_SERVER_ADDRESS", model_server)
+    monkeypatch.setattr(client, "MODEL_SERVER_AUTHKEY", AUTHKEY.encode())
+    monkeypatch.setattr(semantic, "get_collection", lambda: pytest.fail("worker opened the index"))
+
+    semantic.upsert_documents([7], ["7:profile"], ["Candidate Asha. Skills: Python."], [{"log_id": 7, "kind": "profile"}])
+    hits = semantic.semantic_search("python developer", k=5)
+    assert [hit["log_id"] for hit in hits] == [7]
+    semantic.remove_interviews([7])
+    assert semantic.semantic_search("python developer", k=5) == []